@@ -1,6 +1,12 @@
-import pygame
 import numpy as np
 import random
+import re
+import sys
+from collections import OrderedDict
+
+from Lab1AIHashLife import HashLifeUniverse
+from Lab1AIParallel import BandStepper
+from Lab1AIRules import LIFE, RULE_PRESETS, as_rule, neighbor_counts
 
 # Colors (RGB format)
 CELL_ALIVE = (0, 200, 0)   # Green for alive cells
@@ -8,79 +14,633 @@ CELL_DEAD = (60, 60, 60)   # Dark gray for dead cells
 BG_COLOR = (10, 10, 10)    # Black background
 GRID_COLOR = (30, 30, 30)  # Grid lines
 
+# Stepping engines selectable through CellularAutomaton(backend=...)
+BACKENDS = ("loop", "numpy", "bitpacked", "tiled", "parallel")
+
+# Bit-packed grids store 64 cells per little-endian word, column c at bit c % 64
+WORD = np.dtype("<u8")
+WORD_BITS = 64
+
+# Number of set bits in every byte value, for counting live cells of packed grids
+POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+# Cycle detection keeps at most this many state fingerprints
+CYCLE_INDEX_SIZE = 1 << 16
+
+# Multipliers giving each cell two independent 64-bit Zobrist keys, see zobrist_keys
+ZOBRIST_SEEDS = np.array([0x9E3779B97F4A7C15, 0xD1B54A32D192ED03], dtype=np.uint64)
+
+RLE_HEADER = re.compile(r"x\s*=\s*(?P<x>\d+)\s*,\s*y\s*=\s*(?P<y>\d+)(?:\s*,\s*rule\s*=\s*(?P<rule>\S+))?")
+
+
+def zobrist_keys(cells):
+    """
+    Two 64-bit Zobrist keys for each flat cell index, shape (len(cells), 2).
+    The keys are derived with the splitmix64 finalizer rather than stored, so huge boards need no key table.
+    """
+    z = (np.asarray(cells, dtype=np.uint64)[:, None] + np.uint64(1)) * ZOBRIST_SEEDS
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def step_numpy(grid, rule=LIFE):
+    """
+    Computes the next generation of a toroidal grid with whole-array operations:
+    neighbor counts from rolled copies, then one lookup in the rule table.
+    """
+    return rule.table[grid, neighbor_counts(grid, rule)].astype(grid.dtype)
+
+
+def pack_grid(grid):
+    """
+    Packs a 0/1 grid into rows of 64-bit words; padding bits past the last column stay zero.
+    """
+    rows, cols = grid.shape
+    words = (cols + WORD_BITS - 1) // WORD_BITS
+    packed = np.zeros((rows, words * WORD.itemsize), dtype=np.uint8)
+    packed[:, :(cols + 7) // 8] = np.packbits(grid.astype(bool), axis=1, bitorder="little")
+    return packed.view(WORD)
+
+
+def unpack_grid(packed, cols):
+    """
+    Expands a bit-packed grid back into a 0/1 uint8 array with the given number of columns.
+    """
+    return np.unpackbits(packed.view(np.uint8), axis=1, count=cols, bitorder="little")
+
+
+def _shift_west(words, cols):
+    # Result bit c holds cell c - 1; column 0 wraps around to the last column
+    last_word, last_bit = divmod(cols - 1, WORD_BITS)
+    out = (words << np.uint64(1)) | np.roll(words >> np.uint64(WORD_BITS - 1), 1, axis=1)
+    out[:, 0] = (out[:, 0] & ~np.uint64(1)) | ((words[:, last_word] >> np.uint64(last_bit)) & np.uint64(1))
+    out[:, last_word] &= np.uint64((1 << (last_bit + 1)) - 1)
+    return out
+
+
+def _shift_east(words, cols):
+    # Result bit c holds cell c + 1; the last column wraps around to column 0
+    last_word, last_bit = divmod(cols - 1, WORD_BITS)
+    out = (words >> np.uint64(1)) | (np.roll(words & np.uint64(1), -1, axis=1) << np.uint64(WORD_BITS - 1))
+    keep = np.uint64((1 << last_bit) - 1)
+    out[:, last_word] = (out[:, last_word] & keep) | ((words[:, 0] & np.uint64(1)) << np.uint64(last_bit))
+    return out
+
+
+def step_bitpacked(packed, cols, rule=LIFE):
+    """
+    Computes the next generation of a bit-packed toroidal grid under a life-like rule.
+    The eight neighbor planes are summed with word-wide adder logic, 64 cells per operation.
+    """
+    above = np.roll(packed, 1, axis=0)
+    below = np.roll(packed, -1, axis=0)
+    planes = [above, below]
+    for rows in (above, packed, below):
+        planes.append(_shift_west(rows, cols))
+        planes.append(_shift_east(rows, cols))
+
+    # Four-bit counter, one bit-slice per array: count = s0 + 2*s1 + 4*s2 + 8*s3
+    s0 = np.zeros_like(packed)
+    s1 = np.zeros_like(packed)
+    s2 = np.zeros_like(packed)
+    s3 = np.zeros_like(packed)
+    for plane in planes:
+        carry = s0 & plane
+        s0 ^= plane
+        carry, s1 = s1 & carry, s1 ^ carry
+        carry, s2 = s2 & carry, s2 ^ carry
+        s3 |= carry
+
+    if rule == LIFE:
+        return s1 & ~s2 & ~s3 & (s0 | packed)
+
+    born = np.zeros_like(packed)
+    survive = np.zeros_like(packed)
+    for count in rule.birth | rule.survival:
+        match = ~np.zeros_like(packed)
+        for bit, plane in enumerate((s0, s1, s2, s3)):
+            match &= plane if count >> bit & 1 else ~plane
+        if count in rule.birth:
+            born |= match
+        if count in rule.survival:
+            survive |= match
+    result = (born & ~packed) | (survive & packed)
+    # Padding bits count as dead cells with no neighbors, so B0 rules would switch them on
+    last_bit = (cols - 1) % WORD_BITS
+    result[:, -1] &= np.uint64((1 << (last_bit + 1)) - 1)
+    return result
+
+
+def read_rle(path):
+    """
+    Reads a pattern in the standard RLE format as a list of 0/1 rows usable by apply_preset.
+    Returns (pattern, rule), the rule being None when the header does not name one.
+    """
+    rule = None
+    width = height = 0
+    body = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            header = RLE_HEADER.match(line) if not body else None
+            if header:
+                width, height = int(header["x"]), int(header["y"])
+                rule = header["rule"]
+                continue
+            body.append(line)
+            if "!" in line:
+                break
+
+    rows = [[]]
+    count = ""
+    for ch in "".join(body):
+        if ch.isdigit():
+            count += ch
+            continue
+        run = int(count) if count else 1
+        count = ""
+        if ch == "!":
+            break
+        if ch == "$":
+            rows.extend([] for _ in range(run))
+        else:
+            rows[-1].extend([0 if ch in "b." else 1] * run)
+
+    width = max([width] + [len(row) for row in rows])
+    height = max(height, len(rows))
+    rows.extend([] for _ in range(height - len(rows)))
+    return [row + [0] * (width - len(row)) for row in rows], rule
+
+
+def write_rle(path, grid, rule="B3/S23"):
+    """
+    Writes a 0/1 grid in the standard RLE format, 70 characters per line.
+    """
+    grid = np.asarray(grid)
+    lines = []
+    for row in grid:
+        runs = []
+        alive = np.flatnonzero(row)
+        end = alive[-1] + 1 if len(alive) else 0  # trailing dead cells are implied
+        x = 0
+        while x < end:
+            value = row[x]
+            run = 1
+            while x + run < end and row[x + run] == value:
+                run += 1
+            runs.append(f"{run if run > 1 else ''}{'o' if value else 'b'}")
+            x += run
+        lines.append("".join(runs))
+
+    body = ""
+    blank = 0
+    for i, line in enumerate(lines):
+        if i:
+            if not line and i < len(lines) - 1:
+                blank += 1
+                continue
+            body += f"{blank + 1 if blank else ''}$"
+            blank = 0
+        body += line
+    body += "!"
+    with open(path, "w") as f:
+        f.write(f"x = {grid.shape[1]}, y = {grid.shape[0]}, rule = {rule}\n")
+        for start in range(0, len(body), 70):
+            f.write(body[start:start + 70] + "\n")
+
+
 class CellularAutomaton:
-    def __init__(self, cols, rows, cell_size):
+    def __init__(self, cols, rows, cell_size, backend="numpy", tile_size=16, workers=None, rule=LIFE):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        self.rule = as_rule(rule)
+        self.check_rule(backend, self.rule)
         self.cols = cols
         self.rows = rows
         self.cell_size = cell_size
+        self.backend = backend
+        self.tile_size = tile_size
+        self.tile_rows = (rows + tile_size - 1) // tile_size
+        self.tile_cols = (cols + tile_size - 1) // tile_size
+        # Tiles to recompute next generation, and tiles to repaint (None repaints everything)
+        self.active_tiles = np.ones((self.tile_rows, self.tile_cols), dtype=bool)
+        self.dirty_tiles = None
         self.grid = np.zeros((self.rows, self.cols), dtype=int)
-        self.history = []
+        self.generation = 0
+        self.fingerprints = OrderedDict()  # state digest -> generation it was first seen
+        self.candidate = None  # (first generation, matching generation, packed state) awaiting confirmation
+        self.zobrist = np.zeros(2, dtype=np.uint64)
+        self.live = 0
+        self.period = None
+        self.cycle_start = None
+        self.hashlife = None
+        self.workers = workers
+        self.stepper = None
         self.generate_random_grid()
 
-    def generate_random_grid(self):
-        self.grid = np.random.choice([0, 1], size=(self.rows, self.cols), p=[0.85, 0.15])
-        self.history = []
+    @staticmethod
+    def check_rule(backend, rule):
+        if backend == "bitpacked" and not rule.is_life_like:
+            raise ValueError(f"The bitpacked backend only runs radius-1 Moore rules, not {rule}")
+
+    def set_rule(self, rule):
+        """
+        Switches the rule the board evolves under from the current generation on.
+        """
+        rule = as_rule(rule)
+        self.check_rule(self.backend, rule)
+        self.rule = rule
+        self.close()
+        self.reset_history(self.generation)
+
+    @property
+    def grid(self):
+        """
+        Dense 0/1 view of the board; the bit-packed backend unpacks its words on access.
+        """
+        if self.backend == "bitpacked":
+            return unpack_grid(self.state, self.cols)
+        return self.state
+
+    @grid.setter
+    def grid(self, value):
+        if self.backend == "bitpacked":
+            self.state = pack_grid(value)
+        else:
+            self.state = value
+
+    def generate_random_grid(self, density=0.15, seed=None):
+        """
+        Fills the board with live cells at the given density; the same seed gives the same board.
+        """
+        rng = np.random.default_rng(seed)
+        if self.backend == "bitpacked":
+            state = np.zeros((self.rows, (self.cols + WORD_BITS - 1) // WORD_BITS), dtype=WORD)
+        else:
+            state = np.zeros((self.rows, self.cols), dtype=int)
+        # Fill in bands of rows so the random floats of a huge board never exist all at once
+        band = max(1, (1 << 22) // self.cols)
+        for top in range(0, self.rows, band):
+            bottom = min(top + band, self.rows)
+            alive = rng.random((bottom - top, self.cols)) < density
+            state[top:bottom] = pack_grid(alive) if self.backend == "bitpacked" else alive
+        self.state = state
+        self.reset_history()
 
     def apply_preset(self, preset):
-        self.grid.fill(0)
+        self.state = np.zeros_like(self.state)
         start_x = (self.cols - len(preset[0])) // 2
         start_y = (self.rows - len(preset)) // 2
         for i, row in enumerate(preset):
             for j, value in enumerate(row):
-                self.grid[(start_y + i) % self.rows, (start_x + j) % self.cols] = value
-        self.history = []
+                if value:
+                    self.set_cell((start_y + i) % self.rows, (start_x + j) % self.cols)
+        self.reset_history()
+
+    def reset_history(self, generation=0):
+        """
+        Forgets past generations after the board was replaced; every tile becomes active and dirty.
+        """
+        self.generation = generation
+        self.fingerprints.clear()
+        self.candidate = None
+        self.period = None
+        self.cycle_start = None
+        self.active_tiles[:] = True
+        self.dirty_tiles = None
+        self.rehash()
+        self.record_state()
+
+    def packed_bytes(self):
+        if self.backend == "bitpacked":
+            return self.state.tobytes()
+        return np.packbits(self.state).tobytes()
+
+    def rehash(self):
+        """
+        Recomputes the Zobrist hash and the population from every live cell.
+        """
+        cells = np.flatnonzero(self.grid)
+        self.zobrist = np.bitwise_xor.reduce(zobrist_keys(cells), axis=0)
+        self.live = len(cells)
+
+    def flip_cells(self, cells, born):
+        """
+        Folds cells that changed state into the Zobrist hash and the population; born of them are now alive.
+        """
+        self.zobrist ^= np.bitwise_xor.reduce(zobrist_keys(cells), axis=0)
+        self.live += 2 * int(born) - len(cells)
+
+    def flip_words(self, old, new):
+        """
+        flip_cells for a bit-packed step: only the words that differ are expanded into cells.
+        """
+        rows, words = np.nonzero(old ^ new)
+        if not len(rows):
+            return
+        changed = old[rows, words] ^ new[rows, words]
+        bits = np.unpackbits(changed.view(np.uint8).reshape(-1, WORD.itemsize), axis=1, bitorder="little")
+        which, bit = np.nonzero(bits)
+        cells = rows[which] * self.cols + words[which] * WORD_BITS + bit
+        born = int(POPCOUNT8[(changed & new[rows, words]).view(np.uint8)].sum())
+        self.flip_cells(cells, born)
+
+    def record_state(self):
+        """
+        Indexes the current generation by its 128-bit Zobrist hash, which update_grid keeps up to
+        date from the cells that changed. A hash seen before is a candidate cycle: the board is
+        packed once and compared exactly one candidate period later, which confirms the period
+        and the generation the cycle starts at.
+        """
+        if self.candidate is not None:
+            start, matched, snapshot = self.candidate
+            if self.generation == 2 * matched - start:
+                if self.packed_bytes() == snapshot:
+                    self.cycle_start = start
+                    self.period = matched - start
+                    return
+                # A hash collision: forget it and keep indexing
+                self.candidate = None
+
+        digest = self.zobrist.tobytes()
+        seen = self.fingerprints.get(digest)
+        if seen is not None:
+            if self.candidate is None:
+                self.candidate = (seen, self.generation, self.packed_bytes())
+            return
+        self.fingerprints[digest] = self.generation
+        if len(self.fingerprints) > CYCLE_INDEX_SIZE:
+            self.fingerprints.popitem(last=False)
+
+    def set_cell(self, x, y):
+        if self.backend == "bitpacked":
+            word, bit = divmod(y, WORD_BITS)
+            self.state[x, word] |= np.uint64(1 << bit)
+        else:
+            self.state[x, y] = 1
 
     def count_live_neighbors(self, x, y):
-        offsets = [(-1, -1), (-1, 0), (-1, 1),
-                   (0, -1),         (0, 1),
-                   (1, -1), (1, 0), (1, 1)]
-        
-        count = sum(self.grid[(x + dx) % self.rows, (y + dy) % self.cols] for dx, dy in offsets)
+        count = sum(self.grid[(x + dx) % self.rows, (y + dy) % self.cols] for dx, dy in self.rule.offsets)
         return count
 
-    def update_grid(self):
+    def step_loop(self):
+        """
+        Reference implementation: applies the rule cell by cell.
+        """
         new_state = np.zeros_like(self.grid)
 
         for x in range(self.rows):
             for y in range(self.cols):
                 neighbors = self.count_live_neighbors(x, y)
                 if self.grid[x, y] == 1:
-                    if 2 <= neighbors <= 3:  
+                    if neighbors in self.rule.survival:
                         new_state[x, y] = 1  # Stays alive
                 else:
-                    if neighbors == 3:
+                    if neighbors in self.rule.birth:
                         new_state[x, y] = 1  # Becomes alive
+        return new_state
+
+    def tile_bounds(self, ty, tx):
+        r0, c0 = ty * self.tile_size, tx * self.tile_size
+        return r0, min(r0 + self.tile_size, self.rows), c0, min(c0 + self.tile_size, self.cols)
 
-        self.history.append(self.grid.copy())
-        if len(self.history) > 10:
-            self.history.pop(0)
-        self.grid = new_state
+    def step_tiled(self):
+        """
+        Recomputes only the active tiles in place; each tile reads a halo as wide as the rule's radius.
+        Tiles that change activate every tile within that radius for the next generation, and
+        their changed cells are folded into the state hash.
+        """
+        grid = self.state
+        r = self.rule.radius
+        if self.active_tiles.mean() > 0.5:
+            # Mostly active: one whole-array pass is cheaper than many small ones
+            new_state = step_numpy(grid, self.rule)
+            diff = new_state != grid
+            row_starts = np.arange(0, self.rows, self.tile_size)
+            col_starts = np.arange(0, self.cols, self.tile_size)
+            changed = np.logical_or.reduceat(np.logical_or.reduceat(diff, row_starts, axis=0), col_starts, axis=1)
+            cells = np.flatnonzero(diff)
+            grid[...] = new_state
+        else:
+            # Compute every active tile from the old generation before writing any of them back
+            updates = []
+            for ty, tx in np.argwhere(self.active_tiles):
+                r0, r1, c0, c1 = self.tile_bounds(ty, tx)
+                window = grid[np.ix_(np.arange(r0 - r, r1 + r) % self.rows, np.arange(c0 - r, c1 + r) % self.cols)]
+                tile = step_numpy(window, self.rule)[r:-r, r:-r]
+                if not np.array_equal(tile, window[r:-r, r:-r]):
+                    updates.append((ty, tx, tile))
+            changed = np.zeros_like(self.active_tiles)
+            flipped = [np.empty(0, dtype=np.int64)]
+            for ty, tx, tile in updates:
+                r0, r1, c0, c1 = self.tile_bounds(ty, tx)
+                rows, cols = np.nonzero(tile != grid[r0:r1, c0:c1])
+                flipped.append((rows + r0) * self.cols + cols + c0)
+                grid[r0:r1, c0:c1] = tile
+                changed[ty, tx] = True
+            cells = np.concatenate(flipped)
+        self.flip_cells(cells, np.count_nonzero(grid.reshape(-1)[cells]))
+
+        # A change reaches r cells away, which can cross several tiles when an edge tile is narrow
+        narrowest = min(self.tile_size, self.rows % self.tile_size or self.tile_size, self.cols % self.tile_size or self.tile_size)
+        active = changed
+        for _ in range(-(-r // narrowest)):
+            active = active | np.roll(active, 1, axis=0) | np.roll(active, -1, axis=0)
+            active = active | np.roll(active, 1, axis=1) | np.roll(active, -1, axis=1)
+        self.active_tiles = active
+        if self.dirty_tiles is not None:
+            self.dirty_tiles |= changed
+        return grid
+
+    def step_parallel(self):
+        """
+        Steps the board in horizontal bands, one worker process per band over shared memory.
+        """
+        if self.stepper is None:
+            self.stepper = BandStepper(self.rows, self.cols, self.workers, self.rule)
+        if self.state is not self.stepper.current:
+            self.stepper.load(self.state)
+        self.stepper.step()
+        return self.stepper.current
+
+    def close(self):
+        """
+        Stops the band workers of the parallel backend and frees their shared memory.
+        """
+        if self.stepper is not None:
+            self.state = self.state.copy()
+            self.stepper.close()
+            self.stepper = None
+
+    def update_grid(self):
+        old = self.state
+        if self.backend == "loop":
+            self.state = self.step_loop()
+        elif self.backend == "bitpacked":
+            self.state = step_bitpacked(self.state, self.cols, self.rule)
+        elif self.backend == "tiled":
+            self.state = self.step_tiled()
+        elif self.backend == "parallel":
+            self.state = self.step_parallel()
+        else:
+            self.state = step_numpy(self.state, self.rule)
+        if self.backend == "bitpacked":
+            self.flip_words(old, self.state)
+        elif self.backend != "tiled":
+            cells = np.flatnonzero(self.state != old)
+            self.flip_cells(cells, np.count_nonzero(self.state.reshape(-1)[cells]))
+        if self.backend != "tiled":
+            self.dirty_tiles = None
+
+        self.generation += 1
+        if self.period is None:
+            # Once a cycle is found the run is deterministic, so there is nothing left to index
+            self.record_state()
+
+    def advance(self, n):
+        """
+        Jumps n generations ahead with the HashLife engine.
+        A board whose sides are powers of two is a periodic universe HashLife evolves exactly,
+        whatever the pattern. On other boards the pattern evolves on the unbounded plane and is
+        wrapped back onto the torus, which matches update_grid only while it cannot meet its own
+        wrapped image, so power-of-two jumps are taken largest first while fits_jump allows.
+        The generations left are stepped with update_grid until the run repeats a state, after
+        which whole periods are skipped.
+        """
+        if self.hashlife is None or self.hashlife.rule != self.rule:
+            # Kept between calls so memoized results are reused
+            self.hashlife = HashLifeUniverse(rule=self.rule)
+        left = n
+        if not self.rows & (self.rows - 1) and not self.cols & (self.cols - 1):
+            self.hashlife.load_torus(self.grid)
+            for j in range(n.bit_length()):
+                if n >> j & 1:
+                    self.hashlife.step_torus(j)
+            left = 0
+        else:
+            self.hashlife.load_grid(self.grid)
+            for j in reversed(range(n.bit_length())):
+                if 1 << j <= left and self.fits_jump(1 << j):
+                    self.hashlife.step_pow2(j)
+                    left -= 1 << j
+        grid = self.hashlife.to_grid(self.rows, self.cols)
+        self.grid = grid if self.backend == "bitpacked" else grid.astype(self.state.dtype)
+        self.reset_history(self.generation + n - left)
+
+        while left:
+            if self.period is not None:
+                # The run is periodic from here on, so whole periods change nothing
+                skipped = left - left % self.period
+                self.generation += skipped
+                left -= skipped
+                if not left:
+                    break
+            self.update_grid()
+            left -= 1
+
+    def fits_jump(self, generations):
+        """
+        True when the HashLife pattern can evolve the given number of generations on the plane
+        without any cell seeing a wrapped copy of it: influence travels rule.radius cells per
+        generation, so the bounding box grown by that much on both sides must stay narrower
+        than the board.
+        """
+        box = self.hashlife.bounding_box()
+        if box is None:
+            return True
+        top, left, bottom, right = box
+        reach = 2 * self.rule.radius * generations
+        return bottom - top + 1 + reach < self.rows and right - left + 1 + reach < self.cols
+
+    def population(self):
+        return self.live
 
     def check_state(self):
-        if np.sum(self.grid) == 0:
+        if not self.live:
             return "Extinct"
-        if len(self.history) > 1 and np.array_equal(self.grid, self.history[-2]):
+        if self.period == 1:
             return "Stable"
-        if self.grid.tolist() in [h.tolist() for h in self.history[:-1]]:
+        if self.period is not None:
             return "Oscillating"
         return "Evolving"
 
+class SurfaceRenderer:
+    """
+    Draws the board from a persistent surface: only the tiles the automaton marked dirty are
+    rewritten from the grid and scaled into it, all of them after a reset or a non-tiled step.
+    The grid-line overlay and the status font are built once and reused every frame.
+    """
+
+    OVERLAY_KEY = (255, 0, 255)
+
+    def __init__(self, sim):
+        import pygame
+
+        self.pygame = pygame
+        self.sim = sim
+        self.size = (sim.cols * sim.cell_size, sim.rows * sim.cell_size)
+        self.palette = np.array([CELL_DEAD, CELL_ALIVE], dtype=np.uint8)
+        self.overlay = self.build_overlay()
+        self.font = pygame.font.SysFont(None, 30)
+        self.board = pygame.Surface(self.size)
+
+    def build_overlay(self):
+        # A background gap after each cell, then the grid lines
+        pygame = self.pygame
+        overlay = pygame.Surface(self.size)
+        overlay.fill(self.OVERLAY_KEY)
+        overlay.set_colorkey(self.OVERLAY_KEY)
+        cs = self.sim.cell_size
+        width, height = self.size
+        for x in range(cs - 1, width, cs):
+            pygame.draw.line(overlay, BG_COLOR, (x, 0), (x, height))
+        for y in range(cs - 1, height, cs):
+            pygame.draw.line(overlay, BG_COLOR, (0, y), (width, y))
+        for x in range(0, width, cs):
+            pygame.draw.line(overlay, GRID_COLOR, (x, 0), (x, height))
+        for y in range(0, height, cs):
+            pygame.draw.line(overlay, GRID_COLOR, (0, y), (width, y))
+        return overlay
+
     def draw(self, screen):
-        for x in range(self.rows):
-            for y in range(self.cols):
-                rect = (y * self.cell_size, x * self.cell_size, self.cell_size - 1, self.cell_size - 1)
-                color = CELL_ALIVE if self.grid[x, y] == 1 else CELL_DEAD
-                pygame.draw.rect(screen, color, rect)
+        sim = self.sim
+        dirty = sim.dirty_tiles
+        if dirty is None or dirty.mean() > 0.5:
+            regions = [(0, sim.rows, 0, sim.cols)]
+        else:
+            regions = [sim.tile_bounds(ty, tx) for ty, tx in np.argwhere(dirty)]
+        sim.dirty_tiles = np.zeros((sim.tile_rows, sim.tile_cols), dtype=bool)
+
+        if regions:
+            grid = sim.grid
+            cs = sim.cell_size
+            for r0, r1, c0, c1 in regions:
+                # surfarray is indexed [x, y], so the (rows, cols) grid is transposed
+                cells = self.pygame.surfarray.make_surface(self.palette[grid[r0:r1, c0:c1].T])
+                if cs > 1:
+                    cells = self.pygame.transform.scale(cells, ((c1 - c0) * cs, (r1 - r0) * cs))
+                self.board.blit(cells, (c0 * cs, r0 * cs))
+        screen.blit(self.board, (0, 0))
+        screen.blit(self.overlay, (0, 0))
+
+    def draw_status(self, screen, text):
+        screen.blit(self.font.render(text, True, (255, 255, 255)), (10, 10))
+
 
-        for x in range(0, self.cols * self.cell_size, self.cell_size):
-            pygame.draw.line(screen, GRID_COLOR, (x, 0), (x, self.rows * self.cell_size))
-        for y in range(0, self.rows * self.cell_size, self.cell_size):
-            pygame.draw.line(screen, GRID_COLOR, (0, y), (self.cols * self.cell_size, y))
+def run_simulation(cell_size=20, steps_per_frame=1, fps=10, backend="tiled", pattern_files=(), rule=LIFE):
+    """
+    Opens the simulation window; the board advances steps_per_frame generations per displayed frame.
+    Up/Down arrows double or halve the number of generations per frame, T cycles through RULE_PRESETS.
+    Up to six RLE pattern files can be bound to keys 4-9; a rule named in the file is switched to on load.
+    """
+    # pygame is only needed by the window, headless runs never import it
+    import pygame
 
-def run_simulation():
     pygame.init()
     win_size = (800, 600)
-    cell_size = 20
     cols = win_size[0] // cell_size
     rows = win_size[1] // cell_size
 
@@ -88,7 +648,9 @@ def run_simulation():
     pygame.display.set_caption("Cellular Automaton")
     clock = pygame.time.Clock()
 
-    sim = CellularAutomaton(cols, rows, cell_size)
+    sim = CellularAutomaton(cols, rows, cell_size, backend=backend, rule=rule)
+    rule_names = list(RULE_PRESETS)
+    renderer = SurfaceRenderer(sim)
     paused = False
 
     presets = {
@@ -96,6 +658,8 @@ def run_simulation():
         "pulsar": [[0,0,1,1,1,0,0],[0,0,0,0,0,0,0],[1,0,0,0,0,0,1],[1,0,0,0,0,0,1],[1,0,0,0,0,0,1],[0,0,0,0,0,0,0],[0,0,1,1,1,0,0]],
         "beacon": [[1,1,0,0],[1,1,0,0],[0,0,1,1],[0,0,1,1]],
     }
+    pattern_keys = (pygame.K_4, pygame.K_5, pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9)
+    patterns = {key: read_rle(path) for key, path in zip(pattern_keys, pattern_files)}
 
     running = True
     while running:
@@ -113,21 +677,32 @@ def run_simulation():
                     sim.apply_preset(presets["pulsar"])
                 elif event.key == pygame.K_3:
                     sim.apply_preset(presets["beacon"])
+                elif event.key in patterns:
+                    pattern, pattern_rule = patterns[event.key]
+                    if pattern_rule:
+                        sim.set_rule(pattern_rule)
+                    sim.apply_preset(pattern)
+                elif event.key == pygame.K_t:
+                    current = next((i for i, name in enumerate(rule_names) if RULE_PRESETS[name] == sim.rule), -1)
+                    sim.set_rule(RULE_PRESETS[rule_names[(current + 1) % len(rule_names)]])
+                elif event.key == pygame.K_UP:
+                    steps_per_frame *= 2
+                elif event.key == pygame.K_DOWN:
+                    steps_per_frame = max(1, steps_per_frame // 2)
 
         screen.fill(BG_COLOR)
-        sim.draw(screen)
+        renderer.draw(screen)
         if not paused:
-            sim.update_grid()
+            for _ in range(steps_per_frame):
+                sim.update_grid()
 
         state_text = sim.check_state()
-        font = pygame.font.SysFont(None, 30)
-        text_surface = font.render(f"State: {state_text}", True, (255, 255, 255))
-        screen.blit(text_surface, (10, 10))
+        renderer.draw_status(screen, f"State: {state_text}  Gen: {sim.generation}  x{steps_per_frame}  Rule: {sim.rule}")
 
         pygame.display.flip()
-        clock.tick(10)  
+        clock.tick(fps)
 
     pygame.quit()
 
 if __name__ == '__main__':
-    run_simulation()
+    run_simulation(pattern_files=sys.argv[1:])
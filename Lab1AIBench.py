@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Lab1AI import BACKENDS, CellularAutomaton
+
+DEFAULT_SIZES = ["40x30", "256x256", "1024x1024", "4096x4096", "16384x16384"]
+DEFAULT_DENSITIES = [0.05, 0.15, 0.35]
+
+# Rough working-set size per cell while stepping, used to skip runs that would not fit in memory
+BYTES_PER_CELL = {"loop": 16, "numpy": 40, "tiled": 40, "parallel": 12, "bitpacked": 2}
+
+
+def parse_size(text):
+    cols, rows = text.lower().split("x")
+    return int(cols), int(rows)
+
+
+def bench_one(cols, rows, density, backend, seed, seconds, min_generations):
+    """
+    Times one backend on one random board; returns a result record.
+    """
+    record = {"cols": cols, "rows": rows, "density": density, "backend": backend, "seed": seed}
+
+    # Peak Python-side allocation (numpy buffers included) over setup and two generations
+    tracemalloc.start()
+    sim = CellularAutomaton(cols, rows, 1, backend=backend)
+    sim.generate_random_grid(density, seed)
+    sim.update_grid()
+    sim.update_grid()
+    record["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    tracemalloc.stop()
+
+    generations = 0
+    started = time.perf_counter()
+    while generations < min_generations or time.perf_counter() - started < seconds:
+        sim.update_grid()
+        generations += 1
+    elapsed = time.perf_counter() - started
+
+    calls = 0
+    check_started = time.perf_counter()
+    while calls < 10 or time.perf_counter() - check_started < 0.2:
+        sim.check_state()
+        calls += 1
+    check_elapsed = time.perf_counter() - check_started
+
+    # A full rehash of the board, as after a reset; update_grid only folds in the changed cells
+    hash_started = time.perf_counter()
+    sim.rehash()
+    hash_elapsed = time.perf_counter() - hash_started
+    sim.close()
+
+    record.update(
+        status="ok",
+        generations=generations,
+        seconds=round(elapsed, 4),
+        generations_per_second=round(generations / elapsed, 3),
+        cells_per_second=round(generations * cols * rows / elapsed),
+        check_state_ms=round(check_elapsed / calls * 1000, 4),
+        fingerprint_ms=round(hash_elapsed * 1000, 4),
+    )
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark of the cellular automaton stepping backends")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="board sizes as COLSxROWS")
+    parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument("--seconds", type=float, default=2.0, help="minimum timed duration per run")
+    parser.add_argument("--min-generations", type=int, default=3)
+    parser.add_argument("--loop-max-cells", type=int, default=64 * 64, help="largest board the loop backend runs on")
+    parser.add_argument("--memory-limit-mb", type=float, default=8192)
+    parser.add_argument("--output", default="-", help="JSON lines file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    out.write(json.dumps({
+        "benchmark": "Lab1AI",
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }) + "\n")
+
+    for size in args.sizes:
+        cols, rows = parse_size(size)
+        for density in args.densities:
+            for backend in args.backends:
+                estimate_mb = cols * rows * BYTES_PER_CELL[backend] / 2**20
+                if backend == "loop" and cols * rows > args.loop_max_cells:
+                    record = {"status": "skipped", "reason": "loop backend limited by --loop-max-cells"}
+                elif estimate_mb > args.memory_limit_mb:
+                    record = {"status": "skipped", "reason": f"needs about {estimate_mb:.0f} MB"}
+                else:
+                    record = bench_one(cols, rows, density, backend, args.seed, args.seconds, args.min_generations)
+                record = {"cols": cols, "rows": rows, "density": density, "backend": backend, **record}
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+    if out is not sys.stdout:
+        out.close()
+
+
+if __name__ == "__main__":
+    main()
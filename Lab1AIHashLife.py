@@ -0,0 +1,259 @@
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from Lab1AIRules import LIFE
+
+# Default number of memoized successor results kept before the least recently used ones are evicted
+DEFAULT_CACHE_SIZE = 1 << 20
+
+
+class Node:
+    """
+    Square quadtree node of side 2**k; leaves (k == 0) are single cells.
+    Nodes are canonical, so equal subtrees are the same object.
+    """
+    __slots__ = ("k", "nw", "ne", "sw", "se", "pop", "__weakref__")
+
+    def __init__(self, k, nw, ne, sw, se, pop):
+        self.k = k
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.pop = pop
+
+
+OFF = Node(0, None, None, None, None, 0)
+ON = Node(0, None, None, None, None, 1)
+
+
+class HashLifeUniverse:
+    """
+    HashLife engine for life-like rules on the unbounded plane, or on a torus with
+    power-of-two sides through load_torus and step_torus.
+    The pattern is a quadtree whose top-left corner sits at (origin_row, origin_col).
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, rule=LIFE):
+        if not rule.is_life_like or 0 in rule.birth:
+            raise ValueError(f"HashLife needs a radius-1 Moore rule without B0, not {rule}")
+        self.rule = rule
+        self.cache_size = cache_size
+        # Canonical nodes drop out on their own once nothing references them
+        self._nodes = weakref.WeakValueDictionary()
+        self._results = OrderedDict()
+        self._empty = [OFF]
+        self.root = self.empty(3)
+        self.origin_row = 0
+        self.origin_col = 0
+        self.generation = 0
+
+    def join(self, nw, ne, sw, se):
+        key = (id(nw), id(ne), id(sw), id(se))
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.k + 1, nw, ne, sw, se, nw.pop + ne.pop + sw.pop + se.pop)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, k):
+        while len(self._empty) <= k:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[k]
+
+    def centre(self, m):
+        """
+        Returns a node one level up with m in the middle, surrounded by empty space.
+        """
+        e = self.empty(m.k - 1)
+        return self.join(
+            self.join(e, e, e, m.nw), self.join(e, e, m.ne, e),
+            self.join(e, m.sw, e, e), self.join(m.se, e, e, e),
+        )
+
+    def _life_4x4(self, m):
+        # Brute-force one generation of the central 2x2 block of a 4x4 node
+        cells = [[0] * 4 for _ in range(4)]
+        for qi, quad in enumerate((m.nw, m.ne, m.sw, m.se)):
+            for ci, cell in enumerate((quad.nw, quad.ne, quad.sw, quad.se)):
+                cells[(qi // 2) * 2 + ci // 2][(qi % 2) * 2 + ci % 2] = cell.pop
+
+        def next_cell(r, c):
+            count = sum(cells[r + dr][c + dc] for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+            return ON if self.rule.table[cells[r][c], count] else OFF
+
+        return self.join(next_cell(1, 1), next_cell(1, 2), next_cell(2, 1), next_cell(2, 2))
+
+    def successor(self, m, j):
+        """
+        Returns the central node of m (level k - 1) advanced by 2**j generations, j <= k - 2.
+        """
+        j = min(j, m.k - 2)
+        key = (m, j)
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            return result
+
+        if m.pop == 0:
+            result = m.nw
+        elif m.k == 2:
+            result = self._life_4x4(m)
+        else:
+            join = self.join
+            sub = min(j, m.k - 3)
+            c1 = self.successor(m.nw, sub)
+            c2 = self.successor(join(m.nw.ne, m.ne.nw, m.nw.se, m.ne.sw), sub)
+            c3 = self.successor(m.ne, sub)
+            c4 = self.successor(join(m.nw.sw, m.nw.se, m.sw.nw, m.sw.ne), sub)
+            c5 = self.successor(join(m.nw.se, m.ne.sw, m.sw.ne, m.se.nw), sub)
+            c6 = self.successor(join(m.ne.sw, m.ne.se, m.se.nw, m.se.ne), sub)
+            c7 = self.successor(m.sw, sub)
+            c8 = self.successor(join(m.sw.ne, m.se.nw, m.sw.se, m.se.sw), sub)
+            c9 = self.successor(m.se, sub)
+            if j < m.k - 2:
+                # Only 2**j generations wanted: take the centres without a second pass
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw), join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw), join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                result = join(
+                    self.successor(join(c1, c2, c4, c5), sub), self.successor(join(c2, c3, c5, c6), sub),
+                    self.successor(join(c4, c5, c7, c8), sub), self.successor(join(c5, c6, c8, c9), sub),
+                )
+
+        self._results[key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    def _is_padded(self, m):
+        # True when every live cell lies in the central half of m
+        inner = m.nw.se.pop + m.ne.sw.pop + m.sw.ne.pop + m.se.nw.pop
+        return m.k >= 3 and inner == m.pop
+
+    def _grow(self):
+        half = 1 << (self.root.k - 1)
+        self.root = self.centre(self.root)
+        self.origin_row -= half
+        self.origin_col -= half
+
+    def step_pow2(self, j):
+        """
+        Advances the universe by exactly 2**j generations.
+        """
+        while self.root.k < j + 2 or not self._is_padded(self.root):
+            self._grow()
+        # successor() of the centred root covers the same square as the current root
+        self.root = self.successor(self.centre(self.root), j)
+        self.generation += 1 << j
+
+    def step_torus(self, j):
+        """
+        Advances a universe loaded with load_torus by exactly 2**j generations.
+        The period is repeated into a node large enough for the jump; every aligned
+        period-sized square of its successor is the advanced period.
+        """
+        period = self.root
+        node = period
+        while node.k < max(j, period.k) + 2:
+            node = self.join(node, node, node, node)
+        node = self.successor(node, j)
+        while node.k > period.k:
+            node = node.nw
+        self.root = node
+        self.generation += 1 << j
+
+    def advance(self, n):
+        """
+        Advances the universe by n generations, one power-of-two jump per set bit of n.
+        """
+        j = 0
+        while n:
+            if n & 1:
+                self.step_pow2(j)
+            n >>= 1
+            j += 1
+
+    def _build(self, grid, k):
+        if k == 0:
+            return ON if grid[0, 0] else OFF
+        if not grid.any():
+            return self.empty(k)
+        half = 1 << (k - 1)
+        return self.join(
+            self._build(grid[:half, :half], k - 1), self._build(grid[:half, half:], k - 1),
+            self._build(grid[half:, :half], k - 1), self._build(grid[half:, half:], k - 1),
+        )
+
+    def load_grid(self, grid, origin_row=0, origin_col=0):
+        """
+        Replaces the pattern with the live cells of a dense grid; memoized results are kept.
+        """
+        rows, cols = grid.shape
+        k = max(3, (max(rows, cols) - 1).bit_length())
+        square = np.zeros((1 << k, 1 << k), dtype=bool)
+        square[:rows, :cols] = grid
+        self.root = self._build(square, k)
+        self.origin_row = origin_row
+        self.origin_col = origin_col
+        self.generation = 0
+
+    def load_torus(self, grid):
+        """
+        Loads a toroidal grid whose sides are powers of two as one period of a periodic universe,
+        to be advanced with step_torus; the shorter side is repeated to make the period square.
+        """
+        rows, cols = grid.shape
+        if rows & (rows - 1) or cols & (cols - 1):
+            raise ValueError(f"A periodic universe needs power-of-two sides, not {cols}x{rows}")
+        side = max(rows, cols)
+        self.root = self._build(np.tile(grid.astype(bool), (side // rows, side // cols)), side.bit_length() - 1)
+        self.origin_row = 0
+        self.origin_col = 0
+        self.generation = 0
+
+    def live_cells(self):
+        """
+        Yields (row, col) of every live cell in plane coordinates.
+        """
+        stack = [(self.root, self.origin_row, self.origin_col)]
+        while stack:
+            node, row, col = stack.pop()
+            if node.pop == 0:
+                continue
+            if node.k == 0:
+                yield row, col
+                continue
+            half = 1 << (node.k - 1)
+            stack.append((node.nw, row, col))
+            stack.append((node.ne, row, col + half))
+            stack.append((node.sw, row + half, col))
+            stack.append((node.se, row + half, col + half))
+
+    def bounding_box(self):
+        """
+        (top, left, bottom, right) of the live cells in plane coordinates, inclusive; None when empty.
+        """
+        cells = np.array(list(self.live_cells()), dtype=np.int64).reshape(-1, 2)
+        if not len(cells):
+            return None
+        (top, left), (bottom, right) = cells.min(axis=0), cells.max(axis=0)
+        return int(top), int(left), int(bottom), int(right)
+
+    def to_grid(self, rows, cols):
+        """
+        Exports the pattern as a dense rows x cols 0/1 grid, wrapping plane coordinates onto the torus.
+        """
+        grid = np.zeros((rows, cols), dtype=np.uint8)
+        cells = np.array(list(self.live_cells()), dtype=np.int64).reshape(-1, 2)
+        grid[cells[:, 0] % rows, cells[:, 1] % cols] = 1
+        return grid
+
+    @property
+    def population(self):
+        return self.root.pop
@@ -0,0 +1,115 @@
+import multiprocessing
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Lab1AIRules import LIFE, neighbor_counts
+
+
+def step_band(src, dst, r0, r1, rule=LIFE):
+    """
+    Writes the next generation of rows r0:r1 of a toroidal grid from src into dst.
+    rule.radius rows above and below the band are read as a halo, wrapping at the grid edges.
+    """
+    rows = src.shape[0]
+    r = rule.radius
+    window = src[np.arange(r0 - r, r1 + r) % rows]
+    dst[r0:r1] = rule.table[window[r:-r], neighbor_counts(window, rule)[r:-r]]
+
+
+def _band_worker(names, shape, r0, r1, barrier, command, parity, rule):
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    buffers = [np.ndarray(shape, dtype=np.uint8, buffer=block.buf) for block in blocks]
+    try:
+        while True:
+            barrier.wait()
+            generations = command.value
+            if generations < 0:
+                break
+            current = parity.value
+            for _ in range(generations):
+                step_band(buffers[current], buffers[1 - current], r0, r1, rule)
+                current ^= 1
+                # Nobody reads the next generation before every band has written it
+                barrier.wait()
+    finally:
+        del buffers
+        for block in blocks:
+            block.close()
+
+
+def _release(processes, barrier, command, blocks):
+    command.value = -1
+    if any(process.is_alive() for process in processes):
+        try:
+            barrier.wait(timeout=5)
+        except Exception:
+            pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # A caller still holds a view of the grid; the segment is freed when it goes away
+            pass
+        block.unlink()
+
+
+class BandStepper:
+    """
+    Steps a toroidal grid with one worker process per horizontal band.
+    The grid lives in a shared-memory double buffer, so no grid data is pickled between generations.
+    """
+
+    def __init__(self, rows, cols, workers=None, rule=LIFE):
+        workers = min(workers or multiprocessing.cpu_count(), rows)
+        self.shape = (rows, cols)
+        self.blocks = [shared_memory.SharedMemory(create=True, size=rows * cols) for _ in range(2)]
+        self.buffers = [np.ndarray(self.shape, dtype=np.uint8, buffer=block.buf) for block in self.blocks]
+        self.barrier = multiprocessing.Barrier(workers + 1)
+        self.command = multiprocessing.Value("q", 0, lock=False)
+        self.parity = multiprocessing.Value("b", 0, lock=False)
+
+        bounds = np.linspace(0, rows, workers + 1).astype(int)
+        names = [block.name for block in self.blocks]
+        self.processes = []
+        # Registered before any worker starts, so a failed start still frees the shared memory
+        self._finalizer = weakref.finalize(self, _release, self.processes, self.barrier, self.command, self.blocks)
+        try:
+            for r0, r1 in zip(bounds[:-1], bounds[1:]):
+                process = multiprocessing.Process(
+                    target=_band_worker,
+                    args=(names, self.shape, int(r0), int(r1), self.barrier, self.command, self.parity, rule),
+                    daemon=True,
+                )
+                process.start()
+                self.processes.append(process)
+        except BaseException:
+            self.buffers = []
+            self._finalizer()
+            raise
+
+    @property
+    def current(self):
+        """
+        The buffer holding the latest generation; it is overwritten two steps later.
+        """
+        return self.buffers[self.parity.value]
+
+    def load(self, grid):
+        self.current[...] = grid
+
+    def step(self, generations=1):
+        self.command.value = generations
+        self.barrier.wait()
+        for _ in range(generations):
+            self.barrier.wait()
+        self.parity.value ^= generations & 1
+
+    def close(self):
+        self.buffers = []
+        self._finalizer()
@@ -0,0 +1,155 @@
+import struct
+import zlib
+
+import numpy as np
+
+from Lab1AI import WORD, WORD_BITS, pack_grid, unpack_grid
+
+# File layout: header, frame records, index, footer.
+# Key frames hold the bit-packed grid as is, so they can be read straight from the memory map;
+# delta frames hold the zlib-compressed XOR with the previous frame.
+MAGIC = b"LIFEREC\0"
+INDEX_MAGIC = b"LIFEIDX\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIII")  # magic, version, flags, rows, cols, keyframe interval
+FOOTER = struct.Struct("<QQ8s")  # index offset, frame count, index magic
+INDEX_DTYPE = np.dtype([("generation", "<u8"), ("offset", "<u8"), ("length", "<u4"), ("key", "u1")])
+FLAG_DELTA = 1
+
+
+def packed_state(sim):
+    """
+    Returns the board of a CellularAutomaton as bit-packed words, whatever its backend.
+    """
+    return sim.state if sim.backend == "bitpacked" else pack_grid(sim.state)
+
+
+class RunWriter:
+    """
+    Appends generations of one board to a recording file.
+    """
+
+    def __init__(self, path, rows, cols, keyframe_interval=64, delta=True):
+        self.rows = rows
+        self.cols = cols
+        self.keyframe_interval = keyframe_interval
+        self.delta = delta
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, FLAG_DELTA if delta else 0, rows, cols, keyframe_interval))
+        self.index = []
+        self.previous = None
+
+    def write(self, packed, generation):
+        """
+        Records one frame given as bit-packed words (see packed_state).
+        """
+        packed = np.ascontiguousarray(packed, dtype=WORD)
+        key = not self.delta or self.previous is None or len(self.index) % self.keyframe_interval == 0
+        data = packed.tobytes() if key else zlib.compress((packed ^ self.previous).tobytes(), 1)
+        self.index.append((generation, self.file.tell(), len(data), key))
+        self.file.write(data)
+        self.previous = packed.copy()
+
+    def write_sim(self, sim):
+        self.write(packed_state(sim), sim.generation)
+
+    def close(self):
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        self.file.write(np.array(self.index, dtype=INDEX_DTYPE).tobytes())
+        self.file.write(FOOTER.pack(index_offset, len(self.index), INDEX_MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RunReader:
+    """
+    Memory-maps a recording and decodes frames on demand.
+    Sequential playback applies one delta per frame; seeking starts from the nearest key frame.
+    """
+
+    def __init__(self, path):
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, flags, self.rows, self.cols, self.keyframe_interval = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} automaton recording")
+        index_offset, count, index_magic = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+        if index_magic != INDEX_MAGIC:
+            raise ValueError(f"{path} has no frame index, the recording was not closed")
+        self.index = np.frombuffer(self.data, dtype=INDEX_DTYPE, count=count, offset=index_offset)
+        self.words = (self.cols + WORD_BITS - 1) // WORD_BITS
+        self._cached = None  # (frame number, packed frame)
+
+    def __len__(self):
+        return len(self.index)
+
+    def generation(self, i):
+        return int(self.index[i]["generation"])
+
+    def find(self, generation):
+        """
+        Returns the number of the last frame recorded at or before the given generation.
+        """
+        return max(0, int(np.searchsorted(self.index["generation"], generation, side="right")) - 1)
+
+    def _raw(self, i):
+        offset, length = int(self.index[i]["offset"]), int(self.index[i]["length"])
+        return self.data[offset:offset + length]
+
+    def frame(self, i):
+        """
+        Returns frame i as bit-packed words; key frames are read-only views of the file.
+        """
+        if self._cached is not None and self._cached[0] == i:
+            return self._cached[1]
+        if self.index[i]["key"]:
+            packed = self._raw(i).view(WORD).reshape(self.rows, self.words)
+        else:
+            if self._cached is not None and self._cached[0] == i - 1:
+                packed = self._cached[1]
+            else:
+                start = i
+                while not self.index[start]["key"]:
+                    start -= 1
+                packed = self.frame(start)
+                for j in range(start + 1, i):
+                    packed = self._apply_delta(packed, j)
+            packed = self._apply_delta(packed, i)
+        self._cached = (i, packed)
+        return packed
+
+    def _apply_delta(self, packed, i):
+        delta = np.frombuffer(zlib.decompress(self._raw(i)), dtype=WORD).reshape(self.rows, self.words)
+        return packed ^ delta
+
+    def grid(self, i):
+        return unpack_grid(self.frame(i), self.cols)
+
+    def restore(self, sim, i):
+        """
+        Resumes a run: loads frame i into a CellularAutomaton of the same size.
+        """
+        if (sim.rows, sim.cols) != (self.rows, self.cols):
+            raise ValueError(f"Recording is {self.cols}x{self.rows}, board is {sim.cols}x{sim.rows}")
+        if sim.backend == "bitpacked":
+            sim.state = np.array(self.frame(i))
+        else:
+            sim.grid = self.grid(i).astype(sim.state.dtype)
+        sim.reset_history(self.generation(i))
+
+
+def record_run(sim, path, generations, keyframe_interval=64, delta=True):
+    """
+    Steps a CellularAutomaton for the given number of generations, recording every frame.
+    """
+    with RunWriter(path, sim.rows, sim.cols, keyframe_interval, delta) as writer:
+        writer.write_sim(sim)
+        for _ in range(generations):
+            sim.update_grid()
+            writer.write_sim(sim)
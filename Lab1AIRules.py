@@ -0,0 +1,153 @@
+import re
+
+import numpy as np
+
+BS_RULE = re.compile(r"^B(?P<birth>\d*)/S(?P<survival>\d*)$|^S(?P<survival2>\d*)/B(?P<birth2>\d*)$", re.IGNORECASE)
+LTL_PART = re.compile(r"^(?P<key>[RCMSBN])(?P<value>.+)$", re.IGNORECASE)
+
+
+def _parse_ranges(text):
+    # "34..58" or "3" or "2..3,6" style lists of counts
+    counts = set()
+    for part in filter(None, text.split("/")):
+        low, _, high = part.partition("..")
+        counts.update(range(int(low), int(high or low) + 1))
+    return counts
+
+
+class Rule:
+    """
+    Outer-totalistic rule: the next state of a cell depends on its own state and the number of
+    live cells in its neighborhood. Compiled once into table[state, count].
+    """
+
+    def __init__(self, birth, survival, radius=1, neighborhood="M", include_center=False):
+        if neighborhood not in ("M", "N"):
+            raise ValueError(f"Unknown neighborhood {neighborhood!r}, expected 'M' (Moore) or 'N' (von Neumann)")
+        self.birth = frozenset(birth)
+        self.survival = frozenset(survival)
+        self.radius = radius
+        self.neighborhood = neighborhood
+        self.include_center = include_center
+        self.offsets = [
+            (dx, dy)
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+            if (neighborhood == "M" or abs(dx) + abs(dy) <= radius) and (include_center or dx or dy)
+        ]
+        self.max_count = len(self.offsets)
+        bad = [c for c in self.birth | self.survival if not 0 <= c <= self.max_count]
+        if bad:
+            raise ValueError(f"Neighbor counts {sorted(bad)} are out of range for {self.max_count} neighbors")
+        self.table = np.zeros((2, self.max_count + 1), dtype=np.uint8)
+        self.table[0, sorted(self.birth)] = 1
+        self.table[1, sorted(self.survival)] = 1
+        self.count_dtype = np.uint8 if self.max_count < 256 else np.uint16
+
+    @classmethod
+    def parse(cls, rulestring):
+        """
+        Parses B/S notation ("B3/S23", "B36/S23", "B2/S", "S23/B3") or
+        Larger than Life notation ("R5,C0,M1,S34..58,B34..45,NM").
+        """
+        text = rulestring.strip()
+        match = BS_RULE.match(text)
+        if match:
+            birth = match["birth"] if match["birth"] is not None else match["birth2"]
+            survival = match["survival"] if match["survival"] is not None else match["survival2"]
+            return cls({int(c) for c in birth}, {int(c) for c in survival})
+
+        fields = {}
+        for part in text.split(","):
+            part_match = LTL_PART.match(part.strip())
+            if not part_match:
+                raise ValueError(f"Cannot parse rule {rulestring!r}")
+            fields[part_match["key"].upper()] = part_match["value"]
+        if not {"R", "S", "B"} <= fields.keys():
+            raise ValueError(f"Cannot parse rule {rulestring!r}")
+        if int(fields.get("C", "0")) > 2:
+            raise ValueError(f"Rule {rulestring!r} has more than two states")
+        return cls(
+            _parse_ranges(fields["B"]), _parse_ranges(fields["S"]), radius=int(fields["R"]),
+            neighborhood=fields.get("N", "M").upper(), include_center=fields.get("M", "0") == "1",
+        )
+
+    @property
+    def is_life_like(self):
+        """
+        True for radius-1 Moore rules that do not count the cell itself, the B/S family.
+        """
+        return self.radius == 1 and self.neighborhood == "M" and not self.include_center
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __str__(self):
+        if self.is_life_like:
+            return "B" + "".join(map(str, sorted(self.birth))) + "/S" + "".join(map(str, sorted(self.survival)))
+
+        def ranges(counts):
+            parts, counts = [], sorted(counts)
+            while counts:
+                low = high = counts.pop(0)
+                while counts and counts[0] == high + 1:
+                    high = counts.pop(0)
+                parts.append(f"{low}..{high}" if high > low else str(low))
+            return "/".join(parts)
+
+        return (f"R{self.radius},C0,M{int(self.include_center)},S{ranges(self.survival)},"
+                f"B{ranges(self.birth)},N{self.neighborhood}")
+
+    def __repr__(self):
+        return f"Rule({str(self)!r})"
+
+
+LIFE = Rule({3}, {2, 3})
+
+RULE_PRESETS = {
+    "Life": LIFE,
+    "HighLife": Rule.parse("B36/S23"),
+    "Seeds": Rule.parse("B2/S"),
+    "Day & Night": Rule.parse("B3678/S34678"),
+    "Bosco": Rule.parse("R5,C0,M1,S34..58,B34..45,NM"),
+}
+
+
+def as_rule(rule):
+    """
+    Accepts a Rule, a preset name or a rulestring.
+    """
+    if isinstance(rule, Rule):
+        return rule
+    if rule in RULE_PRESETS:
+        return RULE_PRESETS[rule]
+    return Rule.parse(rule)
+
+
+def neighbor_counts(grid, rule):
+    """
+    Counts live neighbors of every cell of a toroidal 0/1 grid under the rule's neighborhood.
+    """
+    cells = grid.astype(rule.count_dtype)
+    r = rule.radius
+    if rule.neighborhood == "M":
+        # A Moore box sum is separable: sum along rows, then along columns
+        rows_sum = cells.copy()
+        for d in range(1, r + 1):
+            rows_sum += np.roll(cells, d, axis=1)
+            rows_sum += np.roll(cells, -d, axis=1)
+        counts = rows_sum.copy()
+        for d in range(1, r + 1):
+            counts += np.roll(rows_sum, d, axis=0)
+            counts += np.roll(rows_sum, -d, axis=0)
+        if not rule.include_center:
+            counts -= cells
+        return counts
+
+    counts = np.zeros_like(cells)
+    for dx, dy in rule.offsets:
+        counts += np.roll(np.roll(cells, dx, axis=0), dy, axis=1)
+    return counts
@@ -0,0 +1,102 @@
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+from multiprocessing import Pool
+
+from Lab1AI import BACKENDS, CellularAutomaton
+
+RESULT_FIELDS = (
+    "seed", "density", "cols", "rows", "backend", "rule", "state", "period", "cycle_start", "generations",
+    "initial_population", "final_population", "min_population", "max_population", "mean_population",
+)
+
+
+def run_soup(seed, density, cols=40, rows=30, max_generations=5000, backend="numpy", rule="B3/S23"):
+    """
+    Runs one random soup until it dies out, settles into a cycle or hits max_generations.
+    """
+    sim = CellularAutomaton(cols, rows, 1, backend=backend, rule=rule)
+    try:
+        sim.generate_random_grid(density, seed)
+        populations = [sim.population()]
+        state = sim.check_state()
+        while state == "Evolving" and sim.generation < max_generations:
+            sim.update_grid()
+            populations.append(sim.population())
+            state = sim.check_state()
+    finally:
+        sim.close()
+
+    return {
+        "seed": seed,
+        "density": density,
+        "cols": cols,
+        "rows": rows,
+        "backend": backend,
+        "rule": str(sim.rule),
+        "state": state,
+        "period": sim.period,
+        "cycle_start": sim.cycle_start,
+        "generations": sim.generation,
+        "initial_population": populations[0],
+        "final_population": populations[-1],
+        "min_population": min(populations),
+        "max_population": max(populations),
+        "mean_population": round(sum(populations) / len(populations), 3),
+    }
+
+
+def _run_task(task):
+    return run_soup(*task)
+
+
+def search(seeds, densities, cols=40, rows=30, max_generations=5000, backend="numpy", rule="B3/S23", workers=None):
+    """
+    Yields one result per (density, seed) pair as the worker processes finish them.
+    """
+    tasks = [(seed, density, cols, rows, max_generations, backend, rule) for density, seed in itertools.product(densities, seeds)]
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_run_task, tasks, chunksize=max(1, len(tasks) // (64 * (workers or 1))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless random soup search for the cellular automaton")
+    parser.add_argument("--seeds", type=int, default=100, help="number of seeds per density")
+    parser.add_argument("--seed-start", type=int, default=0)
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.15])
+    parser.add_argument("--cols", type=int, default=40)
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--max-generations", type=int, default=5000)
+    # Runs already live in Pool workers, which cannot start the parallel backend's own processes
+    parser.add_argument("--backend", choices=[b for b in BACKENDS if b not in ("loop", "parallel")], default="numpy")
+    parser.add_argument("--rule", default="B3/S23", help="B/S or Larger than Life rulestring, or a preset name")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="soups.jsonl", help="results file, .csv or .jsonl")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.seed_start, args.seed_start + args.seeds)
+    results = search(seeds, args.densities, args.cols, args.rows, args.max_generations, args.backend, args.rule, args.workers)
+    counts = {}
+    started = time.perf_counter()
+    with open(args.output, "w", newline="") as f:
+        if args.output.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            write = lambda result: f.write(json.dumps(result) + "\n")
+        for result in results:
+            write(result)
+            f.flush()
+            counts[result["state"]] = counts.get(result["state"], 0) + 1
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"{total} runs in {elapsed:.1f}s ({total / elapsed:.1f} runs/s): {counts}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Lab2AIGenerators import GENERATORS, dead_end_ratio
+
+DEFAULT_SIZES = ["51x51", "501x501", "2001x2001"]
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def bench_one(algorithm, width, height, seed, repeat):
+    """
+    Times one generator on one grid size; returns a result record.
+    """
+    generator = GENERATORS[algorithm]
+    record = {"algorithm": algorithm, "width": width, "height": height, "seed": seed}
+
+    # Peak Python-side allocation in a separate run, tracemalloc slows the timed ones down
+    tracemalloc.start()
+    maze = generator((width, height), seed)
+    record["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    tracemalloc.stop()
+
+    times = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        generator((width, height), seed + i + 1)
+        times.append(time.perf_counter() - started)
+    best = min(times)
+
+    record.update(
+        seconds=round(best, 4),
+        cells_per_second=round(width * height / best),
+        dead_ends=round(dead_end_ratio(maze), 4),
+    )
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark of the maze generation algorithms")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="grid sizes as WIDTHxHEIGHT")
+    parser.add_argument("--algorithms", nargs="+", choices=GENERATORS, default=list(GENERATORS))
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per algorithm and size, the best one is kept")
+    parser.add_argument("--output", default="-", help="JSON lines file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    out.write(json.dumps({
+        "benchmark": "Lab2AI",
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }) + "\n")
+
+    for size in args.sizes:
+        width, height = parse_size(size)
+        for algorithm in args.algorithms:
+            out.write(json.dumps(bench_one(algorithm, width, height, args.seed, args.repeat)) + "\n")
+            out.flush()
+
+    if out is not sys.stdout:
+        out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+import random
+
+import numpy as np
+
+# All generators use the MazeGenerator layout: a (height, width) uint8 grid, 1 = wall and 0 = path,
+# with maze cells at odd coordinates and the walls between them at the even ones.
+
+
+def _cell_shape(grid_size):
+    width, height = grid_size
+    if width < 3 or height < 3:
+        raise ValueError(f"Maze grid must be at least 3x3, not {width}x{height}")
+    return (height - 1) // 2, (width - 1) // 2
+
+
+def _carve(grid_size, east, south):
+    """
+    Builds the maze grid from per-cell passage flags: east[r, c] opens the wall to the right of
+    cell (r, c) and south[r, c] the wall below it.
+    """
+    width, height = grid_size
+    rows, cols = east.shape
+    maze = np.ones((height, width), dtype=np.uint8)
+    maze[1:2 * rows:2, 1:2 * cols:2] = 0
+    maze[1:2 * rows:2, 2:2 * cols + 1:2][east] = 0
+    maze[2:2 * rows + 1:2, 1:2 * cols:2][south] = 0
+    return maze
+
+
+def _carve_edges(grid_size, rows, cols, cells_a, cells_b):
+    # Flat cell index pairs (a < b, neighbours) -> passage flags
+    east = np.zeros((rows, cols), dtype=bool)
+    south = np.zeros((rows, cols), dtype=bool)
+    cells_a = np.asarray(cells_a, dtype=np.int64)
+    cells_b = np.asarray(cells_b, dtype=np.int64)
+    horizontal = cells_b - cells_a != cols
+    east.flat[cells_a[horizontal]] = True
+    south.flat[cells_a[~horizontal]] = True
+    return _carve(grid_size, east, south)
+
+
+def generate_dfs_array(grid_size, seed=None):
+    """
+    DFS with backtracking over a flat bytearray, using precomputed index offsets for the four directions.
+    Returns the maze as a (height, width) uint8 array, 1 = wall and 0 = path.
+    """
+    width, height = grid_size
+    _cell_shape(grid_size)
+    size = width * height
+    # Two rows of padding on each side, so stepping off the grid never needs a bounds check
+    pad = 2 * width
+    maze = bytearray([1]) * (size + 2 * pad)
+    unvisited = bytearray(size + 2 * pad)
+    cells_per_row = len(range(1, width - 1, 2))
+    for y in range(1, height - 1, 2):
+        row = pad + y * width
+        unvisited[row + 1:row + 1 + 2 * cells_per_row:2] = b"\x01" * cells_per_row
+
+    # Same order as DIRECTIONS, so a seed gives the same maze as MazeGenerator.generate_step()
+    offsets = (-2 * width, 2 * width, -2, 2)
+    rng = random.Random(seed)
+    start = pad + width + 1
+    maze[start] = 0
+    unvisited[start] = 0
+    stack = [start]
+    while stack:
+        i = stack[-1]
+        neighbors = [i + d for d in offsets if unvisited[i + d]]
+        if neighbors:
+            j = rng.choice(neighbors)
+            unvisited[j] = 0
+            maze[(i + j) // 2] = 0
+            maze[j] = 0
+            stack.append(j)
+        else:
+            stack.pop()
+
+    return np.frombuffer(maze, dtype=np.uint8)[pad:pad + size].reshape(height, width).copy()
+
+
+def generate_kruskal(grid_size, seed=None):
+    """
+    Randomized Kruskal: walls are removed in random order whenever they join two separate
+    regions, tracked with union-find (path halving, union by size).
+    """
+    rows, cols = _cell_shape(grid_size)
+    rng = np.random.default_rng(seed)
+    index = np.arange(rows * cols).reshape(rows, cols)
+    cells_a = np.concatenate([index[:, :-1].ravel(), index[:-1, :].ravel()])
+    cells_b = np.concatenate([index[:, 1:].ravel(), index[1:, :].ravel()])
+    order = rng.permutation(len(cells_a))
+    cells_a, cells_b = cells_a[order].tolist(), cells_b[order].tolist()
+
+    parent = list(range(rows * cols))
+    size = [1] * (rows * cols)
+    kept_a, kept_b = [], []
+    for a, b in zip(cells_a, cells_b):
+        root_a = a
+        while parent[root_a] != root_a:
+            parent[root_a] = parent[parent[root_a]]
+            root_a = parent[root_a]
+        root_b = b
+        while parent[root_b] != root_b:
+            parent[root_b] = parent[parent[root_b]]
+            root_b = parent[root_b]
+        if root_a == root_b:
+            continue
+        if size[root_a] < size[root_b]:
+            root_a, root_b = root_b, root_a
+        parent[root_b] = root_a
+        size[root_a] += size[root_b]
+        kept_a.append(a)
+        kept_b.append(b)
+
+    return _carve_edges(grid_size, rows, cols, kept_a, kept_b)
+
+
+def generate_prim(grid_size, seed=None):
+    """
+    Randomized Prim: grows the maze from one cell, each time joining a random frontier cell
+    to a random neighbour already in the maze.
+    """
+    rows, cols = _cell_shape(grid_size)
+    rng = random.Random(seed)
+    n = rows * cols
+    IN, FRONTIER = 1, 2
+    state = bytearray(n)
+    frontier = []
+    cells_a, cells_b = [], []
+
+    def neighbours(i):
+        r, c = divmod(i, cols)
+        if r > 0:
+            yield i - cols
+        if r < rows - 1:
+            yield i + cols
+        if c > 0:
+            yield i - 1
+        if c < cols - 1:
+            yield i + 1
+
+    def add(i):
+        state[i] = IN
+        for j in neighbours(i):
+            if not state[j]:
+                state[j] = FRONTIER
+                frontier.append(j)
+
+    add(rng.randrange(n))
+    while frontier:
+        # Swap-remove keeps picking a random frontier cell O(1)
+        k = rng.randrange(len(frontier))
+        frontier[k], frontier[-1] = frontier[-1], frontier[k]
+        i = frontier.pop()
+        j = rng.choice([j for j in neighbours(i) if state[j] == IN])
+        cells_a.append(min(i, j))
+        cells_b.append(max(i, j))
+        add(i)
+
+    return _carve_edges(grid_size, rows, cols, cells_a, cells_b)
+
+
+def generate_wilson(grid_size, seed=None):
+    """
+    Wilson's algorithm: loop-erased random walks from each cell not yet in the maze until they hit it.
+    Gives a uniformly random spanning tree.
+    """
+    rows, cols = _cell_shape(grid_size)
+    rng = random.Random(seed)
+    n = rows * cols
+    in_maze = bytearray(n)
+    # The last direction taken out of each cell; overwriting it on revisits erases loops for free
+    step_to = [0] * n
+    cells_a, cells_b = [], []
+
+    in_maze[rng.randrange(n)] = 1
+    for start in range(n):
+        if in_maze[start]:
+            continue
+        i = start
+        while not in_maze[i]:
+            r, c = divmod(i, cols)
+            moves = []
+            if r > 0:
+                moves.append(i - cols)
+            if r < rows - 1:
+                moves.append(i + cols)
+            if c > 0:
+                moves.append(i - 1)
+            if c < cols - 1:
+                moves.append(i + 1)
+            j = rng.choice(moves)
+            step_to[i] = j
+            i = j
+        i = start
+        while not in_maze[i]:
+            in_maze[i] = 1
+            j = step_to[i]
+            cells_a.append(min(i, j))
+            cells_b.append(max(i, j))
+            i = j
+
+    return _carve_edges(grid_size, rows, cols, cells_a, cells_b)
+
+
+def generate_binary_tree(grid_size, seed=None):
+    """
+    Binary tree: every cell opens either its north or its west wall at random, fully vectorized.
+    Biased, with one open corridor along the top row and one down the left column.
+    """
+    rows, cols = _cell_shape(grid_size)
+    rng = np.random.default_rng(seed)
+    north = rng.random((rows, cols)) < 0.5
+    north[0, :] = False
+    north[:, 0] = True
+    north[0, 0] = False
+    west = ~north
+    west[:, 0] = False
+    # Opening north of (r, c) is opening south of (r - 1, c), west of (r, c) is east of (r, c - 1)
+    east = np.zeros((rows, cols), dtype=bool)
+    south = np.zeros((rows, cols), dtype=bool)
+    east[:, :-1] = west[:, 1:]
+    south[:-1, :] = north[1:, :]
+    return _carve(grid_size, east, south)
+
+
+def generate_sidewinder(grid_size, seed=None):
+    """
+    Sidewinder: each row is split into random runs, each run is joined east-west and opens
+    north from one random cell. Vectorized over the whole grid.
+    """
+    rows, cols = _cell_shape(grid_size)
+    rng = np.random.default_rng(seed)
+    close = rng.random((rows, cols)) < 0.5
+    close[:, -1] = True
+    close[0, :] = False
+    east = ~close
+    east[:, -1] = False
+
+    south = np.zeros((rows, cols), dtype=bool)
+    if rows > 1:
+        # Runs of rows 1.. in flat order: a run ends at each closing cell
+        ends = np.flatnonzero(close[1:].ravel())
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        picks = starts + (rng.random(len(starts)) * (ends - starts + 1)).astype(np.int64)
+        # Opening north of a cell in row r + 1 is opening south of the same column in row r
+        south.flat[picks] = True
+    return _carve(grid_size, east, south)
+
+
+GENERATORS = {
+    "dfs": generate_dfs_array,
+    "kruskal": generate_kruskal,
+    "prim": generate_prim,
+    "wilson": generate_wilson,
+    "binary-tree": generate_binary_tree,
+    "sidewinder": generate_sidewinder,
+}
+
+
+def generate(algorithm, grid_size, seed=None):
+    """
+    Generates a maze with one of the GENERATORS by name.
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown maze algorithm {algorithm!r}, expected one of {', '.join(GENERATORS)}")
+    return GENERATORS[algorithm](grid_size, seed)
+
+
+def dead_end_ratio(maze):
+    """
+    Fraction of path cells with exactly one open neighbour, a quick measure of maze texture.
+    """
+    maze = np.asarray(maze, dtype=np.uint8)
+    path = maze[1:-1, 1:-1] == 0
+    open_neighbours = ((maze[:-2, 1:-1] == 0).astype(np.uint8) + (maze[2:, 1:-1] == 0)
+                       + (maze[1:-1, :-2] == 0) + (maze[1:-1, 2:] == 0))
+    return float(np.count_nonzero(path & (open_neighbours == 1)) / max(1, np.count_nonzero(path)))
@@ -0,0 +1,270 @@
+import heapq
+import os
+from collections import deque
+
+import numpy as np
+
+from Lab2AIMazeFile import load_maze, maze_array, maze_hash
+
+
+def graph_cache_path(maze_path, prune=False):
+    """
+    Where the junction graph of a maze file is cached, next to the maze.
+    """
+    return maze_path + (".pruned" if prune else "") + ".graph.npz"
+
+
+class JunctionGraph:
+    """
+    The maze with every corridor collapsed into one weighted edge between its end cells.
+    Nodes are the passable cells that do not have exactly two passable neighbours (junctions
+    and dead ends); edges keep their length and first step, so a corridor is walked again only
+    when a path through it is asked for.
+    Cells are flat indices y * width + x, paths are lists of (x, y) from end to start.
+    """
+
+    def __init__(self, maze, node_cells, edge_u, edge_v, edge_length, edge_step, pruned=False, digest=None):
+        grid = maze_array(maze)
+        self.height, self.width = grid.shape
+        passable = grid == 0
+        passable[0, :] = passable[-1, :] = passable[:, 0] = passable[:, -1] = False
+        self.passable = bytearray(passable.tobytes())
+        self.offsets = (-self.width, self.width, -1, 1)
+        self.digest = digest or maze_hash(maze)
+        self.pruned = pruned
+
+        self.node_cells = np.asarray(node_cells, dtype=np.int64)
+        self.edge_u = np.asarray(edge_u, dtype=np.int32)
+        self.edge_v = np.asarray(edge_v, dtype=np.int32)
+        self.edge_length = np.asarray(edge_length, dtype=np.int32)
+        self.edge_step = np.asarray(edge_step, dtype=np.int8)
+        self.node_of = {cell: node for node, cell in enumerate(self.node_cells.tolist())}
+
+        # Adjacency in CSR form: the edges of node n are adj_edge[adj_start[n]:adj_start[n + 1]]
+        ends = np.concatenate([self.edge_u, self.edge_v])
+        order = np.argsort(ends, kind="stable")
+        self.adj_edge = (order % max(1, len(self.edge_u))).astype(np.int32)
+        self.adj_start = np.searchsorted(ends[order], np.arange(len(self.node_cells) + 1)).astype(np.int64)
+        self._lists = (self.node_cells.tolist(), self.edge_u.tolist(), self.edge_v.tolist(),
+                       self.edge_length.tolist(), self.adj_start.tolist(), self.adj_edge.tolist(),
+                       self.edge_step.tolist())
+        self.expanded = 0
+
+    @classmethod
+    def build(cls, maze, prune=False):
+        """
+        Finds the nodes and traces every corridor once.
+        With prune, dead ends and the corridors leading to them are left out in a single pass;
+        queries starting inside them still work, they reach the graph by a local search.
+        """
+        grid = maze_array(maze)
+        height, width = grid.shape
+        passable = grid == 0
+        passable[0, :] = passable[-1, :] = passable[:, 0] = passable[:, -1] = False
+        degree = np.zeros(grid.shape, dtype=np.uint8)
+        degree[1:-1, 1:-1] = (passable[:-2, 1:-1].astype(np.uint8) + passable[2:, 1:-1]
+                              + passable[1:-1, :-2] + passable[1:-1, 2:])
+        is_node = passable & (degree != 2)
+        node_cells = np.flatnonzero(is_node)
+        node_id = np.full(height * width, -1, dtype=np.int32)
+        node_id[node_cells] = np.arange(len(node_cells), dtype=np.int32)
+
+        flat = bytearray(passable.tobytes())
+        node_list = node_id.tolist()
+        offsets = (-width, width, -1, 1)
+        # First cells of corridors already traced from their other end
+        traced = bytearray(height * width)
+        edge_u, edge_v, edge_length, edge_step = [], [], [], []
+        for u, cell in enumerate(node_cells.tolist()):
+            for k, d in enumerate(offsets):
+                prev, cur = cell, cell + d
+                if not flat[cur] or traced[cur]:
+                    continue
+                length = 1
+                while node_list[cur] == -1:
+                    for o in offsets:
+                        nxt = cur + o
+                        if nxt != prev and flat[nxt]:
+                            break
+                    prev, cur = cur, nxt
+                    length += 1
+                v = node_list[cur]
+                if v == u:
+                    continue  # A loop back to the same junction never shortens a path
+                if length == 1:
+                    if v < u:
+                        continue  # Neighbouring nodes: recorded from the lower one
+                else:
+                    traced[prev] = 1
+                edge_u.append(u)
+                edge_v.append(v)
+                edge_length.append(length)
+                edge_step.append(k)
+
+        edge_u = np.asarray(edge_u, dtype=np.int64)
+        edge_v = np.asarray(edge_v, dtype=np.int64)
+        if prune:
+            dead_end = degree.ravel()[node_cells] == 1
+            keep = ~(dead_end[edge_u] | dead_end[edge_v])
+            remap = np.cumsum(~dead_end) - 1
+            edge_u, edge_v = remap[edge_u[keep]], remap[edge_v[keep]]
+            edge_length = np.asarray(edge_length)[keep]
+            edge_step = np.asarray(edge_step)[keep]
+            node_cells = node_cells[~dead_end]
+        return cls(maze, node_cells, edge_u, edge_v, edge_length, edge_step, pruned=prune)
+
+    def save(self, path):
+        np.savez(path, digest=np.array(self.digest), pruned=np.array(self.pruned), node_cells=self.node_cells,
+                 edge_u=self.edge_u, edge_v=self.edge_v, edge_length=self.edge_length, edge_step=self.edge_step)
+
+    @classmethod
+    def load(cls, path, maze):
+        """
+        Loads a saved graph for maze; raises ValueError if it was built for a different maze.
+        """
+        with np.load(path) as data:
+            digest = str(data["digest"])
+            if digest != maze_hash(maze):
+                raise ValueError(f"{path} was built for a different maze")
+            return cls(maze, data["node_cells"], data["edge_u"], data["edge_v"], data["edge_length"],
+                       data["edge_step"], pruned=bool(data["pruned"]), digest=digest)
+
+    def cell(self, i):
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def _attach(self, origin, target):
+        # Local BFS from origin that stops at graph nodes: {node: distance} plus the parents to
+        # walk back, and the distance to target if it lies in the same stretch of corridor
+        parents = {origin: None}
+        attached = {}
+        direct = None
+        queue = deque([(origin, 0)])
+        while queue:
+            i, dist = queue.popleft()
+            if i == target and direct is None:
+                direct = dist
+            node = self.node_of.get(i)
+            if node is not None:
+                attached[node] = dist
+                continue
+            for d in self.offsets:
+                j = i + d
+                if self.passable[j] and j not in parents:
+                    parents[j] = i
+                    queue.append((j, dist + 1))
+        return attached, parents, direct
+
+    def _walk_edge(self, edge, from_node):
+        # The cells of a corridor from one of its nodes to the other, both included
+        node_cells, edge_u, edge_step = self._lists[0], self._lists[1], self._lists[6]
+        prev = node_cells[edge_u[edge]]
+        cur = prev + self.offsets[edge_step[edge]]
+        cells = [prev]
+        while cur not in self.node_of:
+            cells.append(cur)
+            for o in self.offsets:
+                nxt = cur + o
+                if nxt != prev and self.passable[nxt]:
+                    break
+            prev, cur = cur, nxt
+        cells.append(cur)
+        return cells if edge_u[edge] == from_node else cells[::-1]
+
+    def query(self, start, end):
+        """
+        Shortest path from start to end: A* over the nodes, with the endpoints attached by local BFS.
+        Returns the path from end to start, empty if there is none.
+        """
+        node_cells, edge_u, edge_v, edge_length, adj_start, adj_edge, _ = self._lists
+        width = self.width
+        source, target = self.index(*start), self.index(*end)
+        if not self.passable[source] or not self.passable[target]:
+            return []
+        start_nodes, start_parents, direct = self._attach(source, target)
+        end_nodes, end_parents, _ = self._attach(target, source)
+        ex, ey = end
+
+        def heuristic(node):
+            y, x = divmod(node_cells[node], width)
+            return abs(x - ex) + abs(y - ey)
+
+        best = direct if direct is not None else float("inf")
+        best_node = None
+        dist = {}
+        came_from = {}
+        heap = []
+        for node, d in start_nodes.items():
+            dist[node] = d
+            came_from[node] = None
+            heapq.heappush(heap, (d + heuristic(node), d, node))
+        self.expanded = 0
+        while heap:
+            f, d, node = heapq.heappop(heap)
+            if f >= best:
+                break
+            if d > dist[node]:
+                continue
+            self.expanded += 1
+            if node in end_nodes and d + end_nodes[node] < best:
+                best = d + end_nodes[node]
+                best_node = node
+            for k in range(adj_start[node], adj_start[node + 1]):
+                edge = adj_edge[k]
+                other = edge_v[edge] if edge_u[edge] == node else edge_u[edge]
+                nd = d + edge_length[edge]
+                if nd < dist.get(other, float("inf")):
+                    dist[other] = nd
+                    came_from[other] = (node, edge)
+                    heapq.heappush(heap, (nd + heuristic(other), nd, other))
+
+        if best == float("inf"):
+            return []
+        if best_node is None:
+            # Start and end share a corridor and no junction is on the way
+            cells = [target]
+            while cells[-1] != source:
+                cells.append(start_parents[cells[-1]])
+            return [self.cell(i) for i in cells]
+
+        # start -> first node, node to node through the corridors, last node -> end
+        segments = []
+        node = best_node
+        while came_from[node] is not None:
+            prev_node, edge = came_from[node]
+            segments.append(self._walk_edge(edge, prev_node)[1:])
+            node = prev_node
+        first = []
+        i = node_cells[node]
+        while i is not None:
+            first.append(i)
+            i = start_parents[i]
+        last = []
+        i = node_cells[best_node]
+        while i is not None:
+            last.append(i)
+            i = end_parents[i]
+        forward = first[::-1]
+        for segment in reversed(segments):
+            forward += segment
+        forward += last[1:]
+        return [self.cell(i) for i in reversed(forward)]
+
+def load_or_build(maze_path, prune=False):
+    """
+    Opens a maze file and its junction graph, building and caching the graph next to the
+    maze when there is no cache or it belongs to another version of the maze.
+    """
+    maze = load_maze(maze_path)
+    cache = graph_cache_path(maze_path, prune)
+    if os.path.exists(cache):
+        try:
+            return JunctionGraph.load(cache, maze), maze
+        except ValueError:
+            pass
+    graph = JunctionGraph.build(maze, prune)
+    graph.save(cache)
+    return graph, maze
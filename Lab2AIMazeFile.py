@@ -0,0 +1,168 @@
+import hashlib
+import pickle
+import struct
+
+import numpy as np
+
+# Binary maze format, version 1:
+#   64-byte header: magic, version, flags, width, height, start x/y, end x/y, seed
+#   then `height` rows of ceil(width / 8) bytes, one bit per grid cell (1 = wall), most significant bit first
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIIq")
+HEADER_SIZE = 64
+FLAG_SEED = 1
+
+
+def row_bytes(width):
+    return (width + 7) // 8
+
+
+class MazeWriter:
+    """
+    Writes a maze to the binary format row by row, so the whole maze never has to be in memory.
+    """
+
+    def __init__(self, path, width, height, start=(1, 1), end=None, seed=None, chunk_rows=4096):
+        end = end if end is not None else (width - 2, height - 2)
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.chunk_rows = chunk_rows
+        self.chunk = []
+        self.file = open(path, "wb")
+        header = HEADER.pack(MAGIC, VERSION, FLAG_SEED if seed is not None else 0, width, height,
+                             start[0], start[1], end[0], end[1], seed if seed is not None else -1)
+        self.file.write(header.ljust(HEADER_SIZE, b"\0"))
+
+    def write_row(self, row):
+        self.chunk.append(np.asarray(row, dtype=np.uint8))
+        if len(self.chunk) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self.chunk:
+            self.file.write(np.packbits(np.array(self.chunk, dtype=np.uint8), axis=1).tobytes())
+            self.rows_written += len(self.chunk)
+            self.chunk = []
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        if self.rows_written != self.height:
+            raise ValueError(f"Wrote {self.rows_written} rows to a maze of height {self.height}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_maze(path, maze, start=(1, 1), end=None, seed=None):
+    """
+    Saves a whole maze (list of lists or 2D array, 1 = wall) in the binary format.
+    """
+    maze = np.asarray(maze, dtype=np.uint8)
+    height, width = maze.shape
+    with MazeWriter(path, width, height, start, end, seed) as writer:
+        for row in maze:
+            writer.write_row(row)
+
+
+class MazeFile:
+    """
+    A maze in the binary format, memory-mapped so rows page in only when they are read.
+    maze[y][x] works like on the list-of-lists mazes, 1 = wall and 0 = path.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        magic, version, flags, width, height, sx, sy, ex, ey, seed = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary maze file")
+        if version != VERSION:
+            raise ValueError(f"{path} is a version {version} maze, only version {VERSION} is supported")
+        self.path = path
+        self.width = width
+        self.height = height
+        self.start = (sx, sy)
+        self.end = (ex, ey)
+        self.seed = seed if flags & FLAG_SEED else None
+        self.bits = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=(height, row_bytes(width)))
+        # maze_hash of the read-only mapping, computed on first use
+        self.digest = None
+
+    def row(self, y):
+        return np.unpackbits(self.bits[y], count=self.width)
+
+    def __getitem__(self, y):
+        return self.row(y)
+
+    def __len__(self):
+        return self.height
+
+    def is_wall(self, x, y):
+        return (self.bits[y, x >> 3] >> (7 - (x & 7))) & 1
+
+    def to_array(self):
+        """
+        Unpacks the whole maze into a (height, width) uint8 array.
+        """
+        return np.unpackbits(self.bits, axis=1, count=self.width)
+
+
+def maze_array(maze):
+    """
+    Any maze (list of lists, array or MazeFile) as a (height, width) uint8 array, 1 = wall.
+    """
+    if hasattr(maze, "to_array"):
+        return maze.to_array()
+    return np.asarray(maze, dtype=np.uint8)
+
+
+def _digest(width, height, bits):
+    digest = hashlib.blake2b(struct.pack("<II", width, height), digest_size=16)
+    digest.update(np.ascontiguousarray(bits).tobytes())
+    return digest.hexdigest()
+
+
+def maze_hash(maze):
+    """
+    Content hash of a maze: size plus the packed wall bits, the same for a MazeFile and its array.
+    A MazeFile is read-only, so its hash is computed once and kept on the object.
+    """
+    if isinstance(maze, MazeFile):
+        if maze.digest is None:
+            maze.digest = _digest(maze.width, maze.height, maze.bits)
+        return maze.digest
+    grid = maze_array(maze)
+    return _digest(grid.shape[1], grid.shape[0], np.packbits(grid, axis=1))
+
+
+def load_maze(path, allow_pickle=False):
+    """
+    Opens a binary maze file. Older pickled mazes (maze.pkl) are read as a list of lists only with
+    allow_pickle, since unpickling a file can run arbitrary code; otherwise ValueError is raised.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+    if magic == MAGIC:
+        return MazeFile(path)
+    if not allow_pickle:
+        raise ValueError(f"{path} is not a binary maze file; pickled mazes are only read on request "
+                         f"(convert_pickle, or --import-pkl in Lab2AITask2)")
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def convert_pickle(pickle_path, path):
+    """
+    Converts a pickled maze into the binary format.
+    """
+    with open(pickle_path, "rb") as f:
+        maze = pickle.load(f)
+    write_maze(path, maze)
@@ -0,0 +1,59 @@
+import numpy as np
+import pygame
+
+from Lab2AIMazeFile import maze_array
+
+# Largest window the maze views open; bigger mazes get a smaller cell size
+MAX_SCREEN_SIZE = (1200, 900)
+
+
+def fit_cell_size(grid_size, max_cell_size, max_screen_size=MAX_SCREEN_SIZE):
+    """
+    The largest cell size up to max_cell_size at which the whole maze fits on the screen.
+    """
+    width, height = grid_size
+    return max(1, min(max_cell_size, max_screen_size[0] // width, max_screen_size[1] // height))
+
+
+class MazeRenderer:
+    """
+    Keeps the maze picture on a persistent surface and repaints only the cells touched since the
+    last frame, so a step costs a few fills instead of a full redraw.
+    """
+
+    def __init__(self, screen, maze, cell_size, wall_color, path_color):
+        self.screen = screen
+        self.cell_size = cell_size
+        grid = maze_array(maze)
+        palette = np.array([path_color, wall_color], dtype=np.uint8)
+        # One pixel per cell from the palette, then scaled up to the cell size
+        cells = pygame.surfarray.make_surface(palette[grid.T])
+        self.background = pygame.transform.scale(cells, (grid.shape[1] * cell_size, grid.shape[0] * cell_size))
+        self.dirty = [self.screen.blit(self.background, (0, 0))]
+
+    def cell_rect(self, x, y):
+        return pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
+
+    def paint(self, cells, cell_color):
+        """
+        Repaints the given (x, y) cells with cell_color(x, y) on the background.
+        """
+        for x, y in cells:
+            rect = self.cell_rect(x, y)
+            self.background.fill(cell_color(x, y), rect)
+            self.dirty.append(rect)
+
+    def redraw(self):
+        """
+        Queues the whole picture, e.g. after the window was covered.
+        """
+        self.dirty = [self.screen.get_rect()]
+
+    def present(self):
+        """
+        Copies the touched cells to the screen and updates only those parts of the display.
+        """
+        for rect in self.dirty:
+            self.screen.blit(self.background, rect, rect)
+        pygame.display.update(self.dirty)
+        self.dirty = []
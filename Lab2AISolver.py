@@ -0,0 +1,437 @@
+import heapq
+import time
+from array import array
+from collections import deque
+
+import numpy as np
+
+from Lab2AIMazeFile import maze_array
+
+
+def maze_endpoints(maze, width, height):
+    """
+    Start and end stored in a MazeFile, otherwise the usual (1, 1) and opposite corner.
+    """
+    if hasattr(maze, "start"):
+        return maze.start, maze.end
+    return (1, 1), (width - 2, height - 2)
+
+
+class SearchEngine:
+    """
+    Shared state of the maze search strategies: cell (x, y) is index y * width + x and
+    parent[i] == -1 marks a cell that has not been visited.
+    Subclasses implement _step() (one expansion) and _solve() (the whole search).
+    """
+    name = None
+
+    def __init__(self, maze, start=None, end=None):
+        grid = maze_array(maze)
+        self.height, self.width = grid.shape
+        default_start, default_end = maze_endpoints(maze, self.width, self.height)
+        self.start = tuple(start or default_start)
+        self.end = tuple(end or default_end)
+        width = self.width
+
+        passable = grid == 0
+        # The border counts as wall, so neighbours of a passable cell are always inside the grid
+        passable[0, :] = passable[-1, :] = passable[:, 0] = passable[:, -1] = False
+        self.passable = bytearray(passable.tobytes())
+        self.offsets = (-width, width, -1, 1)
+
+        self.start_index = self.index(*self.start)
+        self.end_index = self.index(*self.end)
+        self.parent = array("i", [-1]) * (width * self.height)
+        self.parent[self.start_index] = self.start_index
+
+        self.expanded = 0
+        self.seconds = 0.0
+        self.done = False
+        self.path = []
+        self.on_path = bytearray(width * self.height)
+        # Flat indices changed by step(), for the renderer
+        self.touched = []
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def cell(self, i):
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def heuristic(self, i):
+        # Manhattan distance to the end
+        y, x = divmod(i, self.width)
+        return abs(x - self.end[0]) + abs(y - self.end[1])
+
+    def step(self):
+        """
+        Expands one cell. Returns False once the end is reached or the maze has no path.
+        """
+        if self.done:
+            return False
+        started = time.perf_counter()
+        searching = self._step()
+        self.seconds += time.perf_counter() - started
+        if not searching:
+            self.done = True
+        return searching
+
+    def solve(self):
+        """
+        Runs the search to the end in one go; returns the path from end to start, empty if there is none.
+        """
+        if not self.done:
+            started = time.perf_counter()
+            self._solve()
+            self.seconds += time.perf_counter() - started
+            self.done = True
+        return self.path
+
+    def stats(self):
+        return {"strategy": self.name, "expanded": self.expanded, "seconds": round(self.seconds, 6),
+                "path_length": len(self.path)}
+
+    def reconstruct_path(self):
+        """
+        Follows the parents back from the end; the path runs from end to start.
+        """
+        path = []
+        i = self.end_index
+        while True:
+            path.append(self.cell(i))
+            self.on_path[i] = 1
+            if i == self.start_index:
+                break
+            i = self.parent[i]
+        self.path = path
+
+    def is_visited(self, x, y):
+        return self.parent[y * self.width + x] != -1
+
+    def is_on_path(self, x, y):
+        return self.on_path[y * self.width + x] == 1
+
+    def path_mask(self):
+        """
+        The path as a (height, width) bool array.
+        """
+        return np.frombuffer(self.on_path, dtype=np.uint8).reshape(self.height, self.width).astype(bool)
+
+
+class BFSEngine(SearchEngine):
+    """
+    Breadth-first search with the queue in a ring buffer.
+    """
+    name = "bfs"
+
+    def __init__(self, maze, start=None, end=None):
+        super().__init__(maze, start, end)
+        self.queue = array("i", [0]) * 1024
+        self.head = 0
+        self.size = 0
+        self._push(self.start_index)
+
+    def _push(self, i):
+        if self.size == len(self.queue):
+            # Full: unroll the ring into a buffer twice the size
+            self.queue = self.queue[self.head:] + self.queue[:self.head] + array("i", [0]) * len(self.queue)
+            self.head = 0
+        self.queue[(self.head + self.size) % len(self.queue)] = i
+        self.size += 1
+
+    def _pop(self):
+        i = self.queue[self.head]
+        self.head = (self.head + 1) % len(self.queue)
+        self.size -= 1
+        return i
+
+    def _step(self):
+        if not self.size:
+            return False
+
+        i = self._pop()
+        self.expanded += 1
+        if i == self.end_index:
+            self.reconstruct_path()
+            return False
+
+        parent = self.parent
+        passable = self.passable
+        for d in self.offsets:
+            j = i + d
+            if passable[j] and parent[j] == -1:
+                parent[j] = i
+                self._push(j)
+                self.touched.append(j)
+        return True
+
+    def _solve(self):
+        parent = self.parent
+        passable = self.passable
+        offsets = self.offsets
+        end = self.end_index
+        # The ring buffer inlined, this loop is the whole cost of a solve
+        queue, head, size = self.queue, self.head, self.size
+        capacity = len(queue)
+        expanded = 0
+        while size:
+            i = queue[head]
+            head += 1
+            if head == capacity:
+                head = 0
+            size -= 1
+            expanded += 1
+            if i == end:
+                break
+            for d in offsets:
+                j = i + d
+                if passable[j] and parent[j] == -1:
+                    parent[j] = i
+                    if size == capacity:
+                        queue = queue[head:] + queue[:head] + array("i", [0]) * capacity
+                        head = 0
+                        capacity = len(queue)
+                    tail = head + size
+                    if tail >= capacity:
+                        tail -= capacity
+                    queue[tail] = j
+                    size += 1
+        self.queue, self.head, self.size = queue, head, size
+        self.expanded += expanded
+        if parent[end] != -1:
+            self.reconstruct_path()
+
+
+class AStarEngine(SearchEngine):
+    """
+    A* with the Manhattan distance to the end and a binary heap; ties go to the cell nearer the end.
+    """
+    name = "astar"
+
+    def __init__(self, maze, start=None, end=None):
+        super().__init__(maze, start, end)
+        self.cost = array("i", [-1]) * (self.width * self.height)
+        self.cost[self.start_index] = 0
+        self.closed = bytearray(self.width * self.height)
+        h = self.heuristic(self.start_index)
+        self.heap = [(h, h, self.start_index)]
+
+    def _expand(self, i):
+        # Pushes the improved neighbours of i, returns them for the renderer
+        g = self.cost[i] + 1
+        opened = []
+        for d in self.offsets:
+            j = i + d
+            if self.passable[j] and not self.closed[j] and (self.cost[j] == -1 or g < self.cost[j]):
+                self.cost[j] = g
+                self.parent[j] = i
+                h = self.heuristic(j)
+                heapq.heappush(self.heap, (g + h, h, j))
+                opened.append(j)
+        return opened
+
+    def _pop(self):
+        # Skips heap entries left behind by a cheaper push of the same cell
+        while self.heap:
+            i = heapq.heappop(self.heap)[2]
+            if not self.closed[i]:
+                self.closed[i] = 1
+                self.expanded += 1
+                return i
+        return -1
+
+    def _step(self):
+        i = self._pop()
+        if i == -1:
+            return False
+        if i == self.end_index:
+            self.reconstruct_path()
+            return False
+        self.touched += self._expand(i)
+        return True
+
+    def _solve(self):
+        while True:
+            i = self._pop()
+            if i == -1:
+                return
+            if i == self.end_index:
+                self.reconstruct_path()
+                return
+            self._expand(i)
+
+
+class BidirectionalBFSEngine(SearchEngine):
+    """
+    Two breadth-first searches, from the start and from the end, that stop where they meet.
+    Each step expands one cell of the side with the smaller frontier; a meeting is only accepted
+    once that side's level is finished, which keeps the path shortest on mazes with loops.
+    """
+    name = "bidirectional"
+
+    def __init__(self, maze, start=None, end=None):
+        super().__init__(maze, start, end)
+        size = self.width * self.height
+        self.parent_back = array("i", [-1]) * size
+        self.parent_back[self.end_index] = self.end_index
+        self.depth = array("i", [-1]) * size
+        self.depth_back = array("i", [-1]) * size
+        self.depth[self.start_index] = 0
+        self.depth_back[self.end_index] = 0
+        self.queues = (deque([self.start_index]), deque([self.end_index]))
+        self.side = 0
+        self.level_left = 1
+        # (length, forward cell, backward cell) of the best meeting found so far
+        self.meeting = (0, self.start_index, self.start_index) if self.start_index == self.end_index else None
+
+    def is_visited(self, x, y):
+        i = y * self.width + x
+        return self.parent[i] != -1 or self.parent_back[i] != -1
+
+    def _step(self):
+        if self.meeting is not None and self.level_left == 0:
+            self.reconstruct_path()
+            return False
+        if self.level_left == 0:
+            if not self.queues[0] or not self.queues[1]:
+                return False
+            # Next level from the side with the smaller frontier
+            self.side = 0 if len(self.queues[0]) <= len(self.queues[1]) else 1
+            self.level_left = len(self.queues[self.side])
+
+        forward = self.side == 0
+        parent, other_parent = (self.parent, self.parent_back) if forward else (self.parent_back, self.parent)
+        depth, other_depth = (self.depth, self.depth_back) if forward else (self.depth_back, self.depth)
+        queue = self.queues[self.side]
+        i = queue.popleft()
+        self.level_left -= 1
+        self.expanded += 1
+        for d in self.offsets:
+            j = i + d
+            if not self.passable[j]:
+                continue
+            if other_parent[j] != -1:
+                length = depth[i] + 1 + other_depth[j]
+                if self.meeting is None or length < self.meeting[0]:
+                    self.meeting = (length, i, j) if forward else (length, j, i)
+            if parent[j] == -1:
+                parent[j] = i
+                depth[j] = depth[i] + 1
+                queue.append(j)
+                self.touched.append(j)
+        return True
+
+    def _solve(self):
+        while self._step():
+            pass
+        self.touched = []
+
+    def reconstruct_path(self):
+        """
+        Joins the backward half (end to the meeting) and the forward half (meeting to start).
+        """
+        _, i, j = self.meeting
+        back = []
+        while True:
+            back.append(j)
+            if j == self.end_index:
+                break
+            j = self.parent_back[j]
+        front = []
+        while True:
+            front.append(i)
+            if i == self.start_index:
+                break
+            i = self.parent[i]
+        cells = back[::-1] + front if back[-1] != front[0] else back[::-1] + front[1:]
+        for k in cells:
+            self.on_path[k] = 1
+        self.path = [self.cell(k) for k in cells]
+
+
+class JPSEngine(AStarEngine):
+    """
+    Jump-point search on the 4-connected grid: A* over the cells where the path can turn.
+    Straight runs without side openings are skipped in one jump, which pays off in open areas
+    and long corridors.
+    """
+    name = "jps"
+
+    def _jump_straight(self, i, d):
+        # Moves along d from i; returns the first jump point, or -1 at a wall
+        passable = self.passable
+        side = self.width if d in (-1, 1) else 1
+        while True:
+            i += d
+            if not passable[i]:
+                return -1
+            if i == self.end_index:
+                return i
+            # A forced neighbour: a side opening that was closed one cell back
+            if (passable[i + side] and not passable[i - d + side]) or (passable[i - side] and not passable[i - d - side]):
+                return i
+            if side == 1 and (self._jump_straight(i, 1) != -1 or self._jump_straight(i, -1) != -1):
+                # Moving vertically, stop where a horizontal jump finds something
+                return i
+
+    def _directions(self, i):
+        # Pruned directions: straight on and the two turns, or all four at the start
+        parent = self.parent[i]
+        if parent == i:
+            return self.offsets
+        delta = i - parent
+        if -self.width < delta < self.width:
+            d = 1 if delta > 0 else -1
+            return (d, -self.width, self.width)
+        d = self.width if delta > 0 else -self.width
+        return (d, -1, 1)
+
+    def _expand(self, i):
+        opened = []
+        for d in self._directions(i):
+            j = self._jump_straight(i, d)
+            if j == -1 or self.closed[j]:
+                continue
+            g = self.cost[i] + abs(j - i) // abs(d)
+            if self.cost[j] == -1 or g < self.cost[j]:
+                self.cost[j] = g
+                self.parent[j] = i
+                h = self.heuristic(j)
+                heapq.heappush(self.heap, (g + h, h, j))
+                opened.append(j)
+        return opened
+
+    def reconstruct_path(self):
+        """
+        Follows the jump points back from the end, filling in the straight runs between them.
+        """
+        path = [self.end_index]
+        i = self.end_index
+        while i != self.start_index:
+            p = self.parent[i]
+            delta = p - i
+            d = (1 if delta > 0 else -1) if -self.width < delta < self.width else (self.width if delta > 0 else -self.width)
+            while i != p:
+                i += d
+                path.append(i)
+        for k in path:
+            self.on_path[k] = 1
+        self.path = [self.cell(k) for k in path]
+
+
+STRATEGIES = {
+    "bfs": BFSEngine,
+    "astar": AStarEngine,
+    "bidirectional": BidirectionalBFSEngine,
+    "jps": JPSEngine,
+}
+
+
+def make_engine(strategy, maze, start=None, end=None):
+    """
+    Creates a search engine from STRATEGIES by name.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown search strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+    return STRATEGIES[strategy](maze, start, end)
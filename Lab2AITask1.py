@@ -1,7 +1,11 @@
-import pygame
+import argparse
+import os
 import random
 import time
-import pickle  # Used to save/load the maze
+from multiprocessing import Pool
+
+from Lab2AIGenerators import GENERATORS, generate
+from Lab2AIMazeFile import MazeWriter, write_maze
 
 # Settings
 CELL_SIZE = 15
@@ -18,12 +22,30 @@ DIRECTIONS = [(0, -2), (0, 2), (-2, 0), (2, 0)]
 
 
 class MazeGenerator:
-    def __init__(self, grid_size):
+    def __init__(self, grid_size, seed=None):
         self.grid_size = grid_size
-        self.maze = [[1 for _ in range(grid_size[0])] for _ in range(grid_size[1])]
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._maze = None
         self.start = (1, 1)
         self.stack = [self.start]
-        self.maze[self.start[1]][self.start[0]] = 0
+        # Cells changed since the renderer last looked, see take_touched()
+        self.touched = [self.start]
+
+    @property
+    def maze(self):
+        """
+        The maze as rows of 1 (wall) and 0 (path). The list the step API works on is only built
+        on first use, so generate_all() never pays for it.
+        """
+        if self._maze is None:
+            self._maze = [[1 for _ in range(self.grid_size[0])] for _ in range(self.grid_size[1])]
+            self._maze[self.start[1]][self.start[0]] = 0
+        return self._maze
+
+    @maze.setter
+    def maze(self, value):
+        self._maze = value
 
     def generate_step(self):
         """
@@ -41,59 +63,191 @@ class MazeGenerator:
                 neighbors.append((nx, ny))
 
         if neighbors:
-            nx, ny = random.choice(neighbors)
+            nx, ny = self.rng.choice(neighbors)
             wall_x, wall_y = (x + nx) // 2, (y + ny) // 2
             self.maze[wall_y][wall_x] = 0
             self.maze[ny][nx] = 0
             self.stack.append((nx, ny))
+            self.touched += [(x, y), (wall_x, wall_y), (nx, ny)]
         else:
             self.stack.pop()
+            self.touched.append((x, y))
+            if self.stack:
+                self.touched.append(self.stack[-1])
 
         return True
 
-    def save_maze(self):
+    def generate_all(self, algorithm="dfs"):
+        """
+        Generates the whole maze in one go on the array backend, without drawing.
+        With "dfs" this gives the same maze as calling generate_step() until it returns False.
+        """
+        self.maze = generate(algorithm, self.grid_size, self.seed)
+        self.stack = []
+        self.touched = []
+        return self.maze
+
+    def take_touched(self):
         """
-        Saves the generated maze to a file.
+        Returns the cells changed since the last call and starts a new list.
         """
-        with open("maze.pkl", "wb") as f:
-            pickle.dump(self.maze, f)
+        touched, self.touched = self.touched, []
+        return touched
+
+    def cell_color(self, x, y):
+        if self.stack and (x, y) == self.stack[-1]:
+            return CURRENT_COLOR
+        return WALL_COLOR if self.maze[y][x] == 1 else PATH_COLOR
 
-    def draw(self, screen):
+    def save_maze(self, path="maze.bin"):
         """
-        Draws the maze generation process.
+        Saves the generated maze to a file in the binary maze format.
         """
-        for y in range(self.grid_size[1]):
-            for x in range(self.grid_size[0]):
-                rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                color = WALL_COLOR if self.maze[y][x] == 1 else PATH_COLOR
-                pygame.draw.rect(screen, color, rect)
+        write_maze(path, self.maze, self.start, seed=self.seed)
+
+
+def _generate_to_file(task):
+    seed, grid_size, path, algorithm = task
+    write_maze(path, generate(algorithm, grid_size, seed), seed=seed)
+    return seed, path
+
+
+def generate_batch(seeds, grid_size, out_dir=".", workers=None, algorithm="dfs"):
+    """
+    Generates one maze per seed across a process pool, saving each as maze_<seed>.bin in out_dir.
+    Yields (seed, path) as the mazes are finished.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(seed, grid_size, os.path.join(out_dir, f"maze_{seed}.bin"), algorithm) for seed in seeds]
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_generate_to_file, tasks)
+
+
+def eller_rows(grid_size, seed=None):
+    """
+    Generates a maze row by row with Eller's algorithm, keeping only the current row's sets in memory.
+    Yields the grid rows (bytearray, 1 = wall, 0 = path) in the same odd-cell layout as MazeGenerator.
+    """
+    width, height = grid_size
+    cells_x, cells_y = (width - 1) // 2, (height - 1) // 2
+    rng = random.Random(seed)
+    sets = list(range(cells_x))
+    next_label = cells_x
+
+    yield bytearray([1]) * width
+    for cy in range(cells_y):
+        last = cy == cells_y - 1
+        members = {}
+        for cx, label in enumerate(sets):
+            members.setdefault(label, []).append(cx)
+
+        # Join neighbors from different sets at random; the last row joins all of them
+        row = bytearray([1]) * width
+        row[1:2 * cells_x:2] = bytes(cells_x)
+        for cx in range(cells_x - 1):
+            a, b = sets[cx], sets[cx + 1]
+            if a != b and (last or rng.random() < 0.5):
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for member in members[b]:
+                    sets[member] = a
+                members[a].extend(members.pop(b))
+                row[2 * cx + 2] = 0
+        yield row
+        if last:
+            break
+
+        # Every set carries on downwards through at least one of its cells
+        below = bytearray([1]) * width
+        next_sets = [None] * cells_x
+        for label, cells in members.items():
+            down = [cx for cx in cells if rng.random() < 0.5] or [rng.choice(cells)]
+            for cx in down:
+                below[2 * cx + 1] = 0
+                next_sets[cx] = label
+        for cx in range(cells_x):
+            if next_sets[cx] is None:
+                next_sets[cx] = next_label
+                next_label += 1
+        sets = next_sets
+        yield below
+
+    for _ in range(height - 2 * cells_y):
+        yield bytearray([1]) * width
+
+
+def save_maze_stream(rows, path, grid_size, seed=None, chunk_rows=4096):
+    """
+    Writes maze rows straight to disk in the binary maze format, in chunks, without holding the maze.
+    """
+    with MazeWriter(path, grid_size[0], grid_size[1], seed=seed, chunk_rows=chunk_rows) as writer:
+        for row in rows:
+            writer.write_row(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maze generation")
+    parser.add_argument("--size", nargs=2, type=int, metavar=("WIDTH", "HEIGHT"), default=GRID_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="maze.bin")
+    parser.add_argument("--stream", action="store_true", help="write an Eller's algorithm maze row by row, without a window")
+    parser.add_argument("--headless", action="store_true", help="generate the whole maze at full speed, without a window")
+    parser.add_argument("--algorithm", choices=GENERATORS, default="dfs", help="generator for --headless and --batch")
+    parser.add_argument("--batch", type=int, metavar="COUNT", help="generate COUNT mazes with seeds from --seed (default 0)")
+    parser.add_argument("--out-dir", default="mazes")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--steps-per-frame", type=int, default=1, help="DFS steps between two frames of the window")
+    parser.add_argument("--cell-size", type=int, default=None, help="pixels per cell, by default the largest that fits")
+    args = parser.parse_args(argv)
+    grid_size = tuple(args.size)
+    if args.stream:
+        save_maze_stream(eller_rows(grid_size, args.seed), args.output, grid_size, args.seed)
+        return
+    if args.headless:
+        write_maze(args.output, generate(args.algorithm, grid_size, args.seed), seed=args.seed)
+        return
+    if args.batch:
+        first = args.seed or 0
+        started = time.perf_counter()
+        for _ in generate_batch(range(first, first + args.batch), grid_size, args.out_dir, args.workers, args.algorithm):
+            pass
+        elapsed = time.perf_counter() - started
+        print(f"{args.batch} mazes in {elapsed:.1f}s ({args.batch / elapsed:.2f} mazes/s)")
+        return
 
-        if self.stack:
-            x, y = self.stack[-1]
-            pygame.draw.rect(screen, CURRENT_COLOR, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+    # pygame is only needed for the window, headless and batch runs never import it
+    import pygame
 
+    from Lab2AIRender import MazeRenderer, fit_cell_size
 
-def main():
     pygame.init()
-    screen = pygame.display.set_mode(SCREEN_SIZE)
+    cell_size = args.cell_size or fit_cell_size(grid_size, CELL_SIZE)
+    screen = pygame.display.set_mode((grid_size[0] * cell_size, grid_size[1] * cell_size))
     pygame.display.set_caption("Maze Generation (DFS)")
 
-    maze = MazeGenerator(GRID_SIZE)
+    maze = MazeGenerator(grid_size, args.seed)
+    renderer = MazeRenderer(screen, maze.maze, cell_size, WALL_COLOR, PATH_COLOR)
     running = True
 
     while running:
-        screen.fill((0, 0, 0))
-        maze.draw(screen)
-        pygame.display.update()
+        generating = True
+        for _ in range(args.steps_per_frame):
+            generating = maze.generate_step()
+            if not generating:
+                break
+        renderer.paint(maze.take_touched(), maze.cell_color)
+        renderer.present()
 
-        if not maze.generate_step():
-            maze.save_maze()  # Save the maze when finished
+        if not generating:
+            maze.save_maze(args.output)  # Save the maze when finished
             time.sleep(1)  # Pause before quitting
             running = False
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                renderer.redraw()
 
     pygame.quit()
 
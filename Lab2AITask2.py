@@ -1,6 +1,15 @@
 import pygame
+import argparse
+import random
 import time
-import pickle  # Used to load saved maze
+from collections import OrderedDict
+
+import numpy as np
+
+from Lab2AIGraph import load_or_build
+from Lab2AIMazeFile import convert_pickle, load_maze, maze_array, maze_hash
+from Lab2AIRender import MazeRenderer, fit_cell_size
+from Lab2AISolver import STRATEGIES, make_engine, maze_endpoints
 
 # Settings
 CELL_SIZE = 15
@@ -15,95 +24,286 @@ SOLUTION_COLOR = (255, 0, 0)
 START_COLOR = (0, 255, 0)
 END_COLOR = (255, 255, 0)
 
+# Number of goal distance fields kept before the least recently used one is dropped
+FIELD_CACHE_SIZE = 4
+
 
 class MazeSolver:
-    def __init__(self, maze):
+    def __init__(self, maze, start=None, end=None, strategy="bfs"):
         self.maze = maze
-        self.start = (1, 1)
-        self.end = (GRID_SIZE[0] - 2, GRID_SIZE[1] - 2)
+        self.engine = make_engine(strategy, maze, start, end)
+        self.grid_size = (self.engine.width, self.engine.height)
+        self.start = self.engine.start
+        self.end = self.engine.end
         self.path = []
-        self.queue = [self.start]
-        self.visited = {self.start: None}
+        # Cells changed since the renderer last looked, see take_touched()
+        self.touched = [self.start, self.end]
 
     def solve_step(self):
         """
-        Solves the maze one step at a time using BFS.
+        Solves the maze one step at a time with the chosen search strategy (BFS by default).
+        """
+        searching = self.engine.step()
+        self.touched += map(self.engine.cell, self.engine.touched)
+        self.engine.touched = []
+        if not searching:
+            self.reconstruct_path()
+        return searching
+
+    def solve(self):
+        """
+        Solves the whole maze at once, without recording touched cells.
+        """
+        self.engine.solve()
+        self.reconstruct_path()
+        return self.path
+
+    def reconstruct_path(self):
+        """
+        Takes the shortest path (end to start) from the engine once the search is over.
         """
-        if not self.queue:
-            return False  # No solution found
+        self.path = self.engine.path
+        self.touched += self.path
 
-        x, y = self.queue.pop(0)
+    def take_touched(self):
+        """
+        Returns the cells changed since the last call and starts a new list.
+        """
+        touched, self.touched = self.touched, []
+        return touched
 
+    def cell_color(self, x, y):
+        if (x, y) == self.start:
+            return START_COLOR
         if (x, y) == self.end:
-            self.reconstruct_path()
-            return False  # Solution found
+            return END_COLOR
+        if self.engine.is_on_path(x, y):
+            return SOLUTION_COLOR
+        if self.engine.is_visited(x, y):
+            return VISITED_COLOR
+        # The engine's flat passable bytes, since indexing a MazeFile unpacks a whole row
+        return PATH_COLOR if self.engine.passable[y * self.engine.width + x] else WALL_COLOR
 
-        for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 1 <= nx < GRID_SIZE[0] - 1 and 1 <= ny < GRID_SIZE[1] - 1 and self.maze[ny][nx] == 0 and (nx, ny) not in self.visited:
-                self.queue.append((nx, ny))
-                self.visited[(nx, ny)] = (x, y)
 
-        return True
+class DistanceField:
+    """
+    Distances to one goal from every cell, from a single BFS. Any start then gets its shortest
+    path by stepping to a neighbour one closer, with no further search.
+    Distances are uint16 when the maze is small enough, else uint32; unreachable cells hold the maximum.
+    """
 
-    def reconstruct_path(self):
+    def __init__(self, maze, goal):
+        grid = maze_array(maze)
+        self.height, self.width = grid.shape
+        self.goal = tuple(goal)
+        width = self.width
+        passable = grid == 0
+        passable[0, :] = passable[-1, :] = passable[:, 0] = passable[:, -1] = False
+        self.dtype = np.uint16 if np.count_nonzero(passable) < np.iinfo(np.uint16).max else np.uint32
+        self.unreachable = int(np.iinfo(self.dtype).max)
+        self.offsets = (-width, width, -1, 1)
+
+        flat = bytearray(passable.tobytes())
+        dist = np.full(width * self.height, self.unreachable, dtype=self.dtype)
+        goal_index = self.goal[1] * width + self.goal[0]
+        if flat[goal_index]:
+            # Level by level, so the BFS loop only appends indices and the distances are set per level
+            seen = bytearray(width * self.height)
+            seen[goal_index] = 1
+            level, depth = [goal_index], 0
+            while level:
+                dist[level] = depth
+                following = []
+                for i in level:
+                    for d in self.offsets:
+                        j = i + d
+                        if flat[j] and not seen[j]:
+                            seen[j] = 1
+                            following.append(j)
+                level = following
+                depth += 1
+        self.dist = dist.reshape(self.height, width)
+
+    def distance(self, x, y):
         """
-        Traces back from the end to reconstruct the shortest path.
+        Length in steps from (x, y) to the goal, None if the goal cannot be reached.
         """
-        current = self.end
-        while current:
-            self.path.append(current)
-            current = self.visited.get(current)
+        d = int(self.dist[y, x])
+        return None if d == self.unreachable else d
 
-    def draw(self, screen):
+    def path_from(self, start):
         """
-        Draws the maze and the solving process.
+        Shortest path from start, listed from the goal back to start like the search engines;
+        empty if the goal cannot be reached.
         """
-        for y in range(GRID_SIZE[1]):
-            for x in range(GRID_SIZE[0]):
-                rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                if (x, y) == self.start:
-                    pygame.draw.rect(screen, START_COLOR, rect)
-                elif (x, y) == self.end:
-                    pygame.draw.rect(screen, END_COLOR, rect)
-                elif (x, y) in self.path:
-                    pygame.draw.rect(screen, SOLUTION_COLOR, rect)
-                elif (x, y) in self.visited:
-                    pygame.draw.rect(screen, VISITED_COLOR, rect)
-                elif self.maze[y][x] == 1:
-                    pygame.draw.rect(screen, WALL_COLOR, rect)
-                else:
-                    pygame.draw.rect(screen, PATH_COLOR, rect)
-
-
-def main():
-    pygame.init()
-    screen = pygame.display.set_mode(SCREEN_SIZE)
-    pygame.display.set_caption("Maze Solving (BFS)")
+        # A memoryview reads plain ints, much faster per step than indexing the numpy array
+        flat = memoryview(self.dist.reshape(-1))
+        i = start[1] * self.width + start[0]
+        d = flat[i]
+        if d == self.unreachable:
+            return []
+        path = [i]
+        while d:
+            for o in self.offsets:
+                if flat[i + o] == d - 1:
+                    i += o
+                    break
+            path.append(i)
+            d -= 1
+        return [(i % self.width, i // self.width) for i in reversed(path)]
+
+    @property
+    def nbytes(self):
+        return self.dist.nbytes
+
 
-    # Load pre-generated maze
-    with open("maze.pkl", "rb") as f:
-        maze = pickle.load(f)
+class FieldCache:
+    """
+    Bounded LRU cache of distance fields keyed by the content hash of the maze and the goal.
+    A MazeFile keeps its hash; for list mazes callers that query repeatedly pass the digest
+    from maze_hash once, so a hit does not hash the whole maze again.
+    """
 
-    solver = MazeSolver(maze)
+    def __init__(self, size=FIELD_CACHE_SIZE):
+        self.size = size
+        self.fields = OrderedDict()
+
+    def get(self, maze, goal, digest=None):
+        key = (digest or maze_hash(maze), tuple(goal))
+        field = self.fields.get(key)
+        if field is not None:
+            self.fields.move_to_end(key)
+            return field
+        field = DistanceField(maze, goal)
+        self.fields[key] = field
+        if len(self.fields) > self.size:
+            self.fields.popitem(last=False)
+        return field
+
+
+field_cache = FieldCache()
+
+
+def goal_field(maze, goal=None, digest=None):
+    """
+    The cached distance field of maze towards goal (the maze's end by default).
+    digest is maze_hash(maze) when the caller already has it.
+    """
+    if goal is None:
+        height, width = len(maze), len(maze[0])
+        goal = maze_endpoints(maze, width, height)[1]
+    return field_cache.get(maze, goal, digest)
+
+
+def answer_agents(maze, count, seed=None):
+    """
+    Routes count agents from random cells to the maze's end through one distance field.
+    """
+    started = time.perf_counter()
+    field = goal_field(maze)
+    print(f"distance field to {field.goal}: {field.dist.dtype}, {field.nbytes / 2**20:.1f} MB, "
+          f"ready in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(seed)
+    cells = np.flatnonzero(field.dist.ravel() != field.unreachable).tolist()
+    total = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        i = rng.choice(cells)
+        total += len(field.path_from((i % field.width, i // field.width)))
+    elapsed = time.perf_counter() - started
+    print(f"{count} agents routed in {elapsed:.2f}s ({count / elapsed:.1f} paths/s), mean path length {total / count:.0f}")
+
+
+def answer_queries(maze_path, count, prune=False, seed=None):
+    """
+    Answers random start/end queries on the junction graph of a maze file and reports the rate.
+    """
+    started = time.perf_counter()
+    graph, _ = load_or_build(maze_path, prune)
+    print(f"junction graph: {len(graph.node_cells)} nodes, {len(graph.edge_u)} edges, "
+          f"ready in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(seed)
+    cells = np.flatnonzero(np.frombuffer(graph.passable, dtype=np.uint8)).tolist()
+    lengths = []
+    started = time.perf_counter()
+    for _ in range(count):
+        start, end = graph.cell(rng.choice(cells)), graph.cell(rng.choice(cells))
+        lengths.append(len(graph.query(start, end)))
+    elapsed = time.perf_counter() - started
+    print(f"{count} queries in {elapsed:.2f}s ({count / elapsed:.1f} queries/s), mean path length {sum(lengths) / count:.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maze solving")
+    parser.add_argument("maze", nargs="?", default="maze.bin", help="maze file, by default maze.bin")
+    parser.add_argument("--import-pkl", metavar="PATH",
+                        help="convert an older pickled maze (only from a trusted source) to the maze file first")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="bfs")
+    parser.add_argument("--compare", action="store_true", help="solve with every strategy without a window and report the work done")
+    parser.add_argument("--queries", type=int, metavar="COUNT",
+                        help="answer COUNT random start/end queries on the cached junction graph, without a window")
+    parser.add_argument("--agents", type=int, metavar="COUNT",
+                        help="route COUNT agents from random cells to the end through one distance field, without a window")
+    parser.add_argument("--prune", action="store_true", help="leave dead ends out of the junction graph")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--steps-per-frame", type=int, default=1, help="search steps between two frames of the window")
+    parser.add_argument("--cell-size", type=int, default=None, help="pixels per cell, by default the largest that fits")
+    args = parser.parse_args(argv)
+
+    # Load pre-generated maze; a pickled maze.pkl from older runs is only read when asked for
+    maze_path = args.maze
+    if args.import_pkl:
+        convert_pickle(args.import_pkl, maze_path)
+    maze = load_maze(maze_path)
+    if args.compare:
+        for strategy in STRATEGIES:
+            engine = make_engine(strategy, maze)
+            engine.solve()
+            stats = engine.stats()
+            print(f"{strategy:>14}: {stats['expanded']:>10} nodes expanded, {stats['seconds']:.3f}s, "
+                  f"path length {stats['path_length']}")
+        return
+    if args.agents:
+        answer_agents(maze, args.agents, args.seed)
+        return
+    if args.queries:
+        answer_queries(maze_path, args.queries, args.prune, args.seed)
+        return
+
+    solver = MazeSolver(maze, strategy=args.strategy)
+    grid_size = solver.grid_size
+
+    pygame.init()
+    cell_size = args.cell_size or fit_cell_size(grid_size, CELL_SIZE)
+    screen = pygame.display.set_mode((grid_size[0] * cell_size, grid_size[1] * cell_size))
+    pygame.display.set_caption(f"Maze Solving ({args.strategy})")
+
+    renderer = MazeRenderer(screen, maze, cell_size, WALL_COLOR, PATH_COLOR)
     running = True
 
     while running:
-        screen.fill((0, 0, 0))
-        solver.draw(screen)
-        pygame.display.update()
+        solving = True
+        for _ in range(args.steps_per_frame):
+            solving = solver.solve_step()
+            if not solving:
+                break
+        renderer.paint(solver.take_touched(), solver.cell_color)
+        renderer.present()
 
-        if not solver.solve_step():
+        if not solving:
             time.sleep(1)  # Pause before quitting
             running = False
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                renderer.redraw()
 
     pygame.quit()
 
-
 if __name__ == "__main__":
     main()
     
\ No newline at end of file
@@ -0,0 +1,223 @@
+from collections import deque
+
+import numpy as np
+
+# Оцінки результатів для очікуваної корисності
+WIN = 1000.0
+DEATH = -1000.0
+EXPLORE = 10.0
+STEP_COST = 1.0
+# Межа шляху стріли, як у класичній грі
+ARROW_RANGE = 5
+
+
+class BeliefAgent:
+    """
+    Автоматичний гравець з імовірнісним станом знань про печери.
+    Для кожної печери зберігаються ймовірності Вампуса (розподіл, сума 1), пасток і кажанів
+    (маргінальні ймовірності, суми 3 і 2) у масивах numpy. Кожне відчуття оновлює лише сусідів
+    поточної печери та перенормовує решту, тож хід коштує O(ступеня) плюс кілька векторних операцій.
+    Після промаху розподіл Вампуса розтікається по тунелях, після перенесення кажанами їхній
+    розподіл скидається. Дію - хід чи постріл - вибирає за очікуваною корисністю.
+    """
+    def __init__(self, game, rng, pits=3, bats=2):
+        self.game = game
+        self.rng = rng
+        self.pit_count = pits
+        self.bat_count = bats
+        self.offsets = np.frombuffer(game.map.offsets, dtype=np.int32).astype(np.int64)
+        self.targets = np.frombuffer(game.map.targets, dtype=np.int32).astype(np.int64)
+        self.degree = np.diff(self.offsets)
+        self.sources = np.repeat(np.arange(len(self.degree)), self.degree)
+        size = game.map.num_caves + 1
+
+        self.wumpus = self._uniform(size, 1.0, game.player)
+        self.pits = self._uniform(size, pits, game.player)
+        self.bats = self._uniform(size, bats, game.player)
+        self.visited = np.zeros(size, dtype=bool)
+        self.frontier = set()
+        # Печери, відчуття пасток і кажанів з яких уже враховані (повторне врахування завищило б оцінку)
+        self.pit_sensed = set()
+        self.bat_sensed = set()
+        self.arrows = game.arrows
+        self.transports = game.bat_transports
+        self.last_path = []
+
+    @staticmethod
+    def _uniform(size, total, player):
+        p = np.full(size, total / (size - 2))
+        p[0] = p[player] = 0.0
+        return p
+
+    def neighbors(self, cave):
+        return self.targets[self.offsets[cave]:self.offsets[cave + 1]]
+
+    @staticmethod
+    def _rescale(p, cells, total):
+        # Решта печер разом зберігає очікувану кількість total
+        fixed = p[cells].sum()
+        rest = p.sum() - fixed
+        if rest > 0:
+            keep = p[cells].copy()
+            np.multiply(p, max(0.0, total - fixed) / rest, out=p)
+            np.minimum(p, 1.0, out=p)
+            p[cells] = keep
+
+    def _sense(self, p, cells, present, total):
+        if present:
+            # Хоча б один об'єкт серед cells; печери вважаються незалежними
+            none = np.prod(1.0 - p[cells])
+            if none < 1.0:
+                p[cells] = np.minimum(1.0, p[cells] / (1.0 - none))
+        else:
+            p[cells] = 0.0
+        self._rescale(p, cells, total)
+
+    def _clear(self, p, cave, total):
+        p[cave] = 0.0
+        self._rescale(p, [cave], total)
+
+    def _normalize_wumpus(self):
+        total = self.wumpus.sum()
+        if total > 0:
+            self.wumpus /= total
+
+    def _wumpus_missed(self):
+        # Стріла пройшла повз ці печери, далі Вампус з імовірністю 0.75 йде в сусідню
+        self.wumpus[self.last_path] = 0.0
+        self._normalize_wumpus()
+        spread = np.bincount(self.targets, weights=self.wumpus[self.sources] / self.degree[self.sources],
+                             minlength=len(self.wumpus))
+        self.wumpus = 0.25 * self.wumpus + 0.75 * spread
+
+    def observe(self):
+        """
+        Враховує все, що сталося з минулого ходу, і відчуття в поточній печері.
+        """
+        game = self.game
+        if game.arrows < self.arrows:
+            self._wumpus_missed()
+            self.arrows = game.arrows
+        if game.bat_transports != self.transports:
+            # Кажани перелетіли: старі знання про них більше нічого не варті
+            self.bats = self._uniform(len(self.bats), self.bat_count, game.player)
+            self.bat_sensed.clear()
+            self.transports = game.bat_transports
+
+        cave = game.player
+        # Гравець живий і стоїть тут, отже тут немає ні Вампуса, ні пастки, ні кажанів
+        self.wumpus[cave] = 0.0
+        self._normalize_wumpus()
+        if self.pits[cave]:
+            self._clear(self.pits, cave, self.pit_count)
+        if self.bats[cave]:
+            self._clear(self.bats, cave, self.bat_count)
+        if not self.visited[cave]:
+            self.visited[cave] = 1
+            self.frontier.discard(cave)
+            self.frontier.update(c for c in self.neighbors(cave).tolist() if not self.visited[c])
+
+        stench, breeze, rustle = game.percepts()
+        cells = self.neighbors(cave)
+        if stench:
+            mask = np.zeros(len(self.wumpus), dtype=bool)
+            mask[cells] = True
+            self.wumpus[~mask] = 0.0
+        else:
+            self.wumpus[cells] = 0.0
+        self._normalize_wumpus()
+        if cave not in self.pit_sensed:
+            self.pit_sensed.add(cave)
+            self._sense(self.pits, cells, breeze, self.pit_count)
+        if cave not in self.bat_sensed:
+            self.bat_sensed.add(cave)
+            self._sense(self.bats, cells, rustle, self.bat_count)
+
+    def risk(self, caves):
+        """
+        Імовірність загинути, увійшовши в кожну з печер.
+        """
+        return 1.0 - (1.0 - self.wumpus[caves]) * (1.0 - self.pits[caves])
+
+    def _move_value(self, caves):
+        risk = self.risk(caves)
+        # Кажани переносять у випадкову печеру, де теж може чекати смерть
+        bat_death = (1.0 + self.pit_count) / (len(self.wumpus) - 1)
+        explore = np.where(self.visited[caves], 0.0, EXPLORE)
+        return DEATH * risk + (1.0 - risk) * (self.bats[caves] * bat_death * DEATH + explore)
+
+    def best_move(self):
+        """
+        Найкращий хід і його корисність. Відвідані печери самі нічого не дають, тому ціль - завжди
+        печера на межі дослідженого, найкраща з урахуванням відстані до неї через відвідані печери.
+        Якщо межі немає, гравець блукає навмання.
+        """
+        player = self.game.player
+        cells = self.neighbors(player)
+        if not self.frontier:
+            return DEATH, int(self.rng.choice(cells.tolist()))
+        frontier = np.fromiter(self.frontier, dtype=np.int64, count=len(self.frontier))
+        ceiling = float(self._move_value(frontier).max())
+
+        # Пошук у ширину по відвіданих печерах; ціль на відстані dist варта щонайбільше
+        # ceiling - dist, тож пошук зупиняється, щойно далі кращої цілі бути не може
+        first = {player: None}
+        queue = deque([(player, 1)])
+        best_value, best_step = float("-inf"), None
+        while queue:
+            cave, dist = queue.popleft()
+            if best_value + dist * STEP_COST >= ceiling:
+                break
+            nxt = self.neighbors(cave)
+            values = self._move_value(nxt)
+            for c, value in zip(nxt.tolist(), values.tolist()):
+                if c in first:
+                    continue
+                first[c] = first[cave] if first[cave] is not None else c
+                if not self.visited[c]:
+                    value -= dist * STEP_COST
+                    if value > best_value:
+                        best_value, best_step = value, first[c]
+                else:
+                    queue.append((c, dist + 1))
+        if best_step is None:
+            # Межа недосяжна відвіданими печерами (після перенесення кажанами) - крок навмання
+            return DEATH, int(self.rng.choice(cells.tolist()))
+        return best_value, best_step
+
+    def best_shot(self):
+        """
+        Найкращий шлях стріли: жадібно через печери з найбільшою ймовірністю Вампуса.
+        Повертає корисність і шлях.
+        """
+        player = self.game.player
+        path = []
+        cave = player
+        for _ in range(ARROW_RANGE):
+            options = [c for c in self.neighbors(cave).tolist() if c != player and c not in path]
+            if not options:
+                break
+            nxt = max(options, key=self.wumpus.__getitem__)
+            if self.wumpus[nxt] <= 0.0:
+                break
+            path.append(nxt)
+            cave = nxt
+        if not path:
+            return float("-inf"), []
+        hit = float(self.wumpus[path].sum())
+        if self.game.arrows == 1:
+            miss = DEATH
+        else:
+            # Вампус, що вижив, може прийти до гравця
+            came = sum(self.wumpus[c] / self.degree[c] for c in self.neighbors(player).tolist() if c not in path)
+            miss = -WIN / self.game.arrows + DEATH * 0.75 * came / max(1e-9, 1.0 - hit)
+        return hit * WIN + (1.0 - hit) * miss, path
+
+    def act(self):
+        self.observe()
+        move_value, cave = self.best_move()
+        shot_value, path = self.best_shot()
+        if path and shot_value > move_value:
+            self.last_path = path
+            return "shoot", path
+        return "move", cave
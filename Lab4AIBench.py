@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# Як кожен модуль створює гру свого інтерфейсу: консоль обгортає Game рушія, щоб виводити
+# повідомлення, вікно грає в Game рушія напряму
+FRONT_END_GAMES = {
+    "Lab4AIEngine": "Lab4AIEngine.Game({caves}, seed={seed})",
+    "Lab4AIConsole": "Lab4AIConsole.Game({caves}, seed={seed}, output=lambda *_: None)",
+    "Lab4AIVisual": "Lab4AIVisual.Game({caves}, seed={seed})",
+}
+DEFAULT_MODULES = list(FRONT_END_GAMES)
+
+# Виконується в новому інтерпретаторі, щоб імпорт не був закешований
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+game = {make_game}
+game.move_player(game.map.get_neighbors(game.player)[0])
+finished = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_turn_ms": (finished - imported) * 1000,
+    "pygame_loaded": "pygame" in sys.modules,
+}}))
+"""
+
+
+def bench_module(module, caves, seed, repeat):
+    """
+    Запускає модуль у новому процесі repeat разів; повертає найкращі час імпорту,
+    час від імпорту до першого ходу і повний час запуску процесу.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    make_game = FRONT_END_GAMES[module].format(caves=caves, seed=seed)
+    probe = PROBE.format(module=module, make_game=make_game)
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", probe], cwd=here, check=True,
+                                capture_output=True, text=True).stdout
+        run = json.loads(output.splitlines()[-1])
+        run["process_ms"] = (time.perf_counter() - started) * 1000
+        runs.append(run)
+    return {
+        "module": module,
+        "caves": caves,
+        "import_ms": round(min(r["import_ms"] for r in runs), 2),
+        "first_turn_ms": round(min(r["first_turn_ms"] for r in runs), 2),
+        "process_ms": round(min(r["process_ms"] for r in runs), 2),
+        "pygame_loaded": runs[0]["pygame_loaded"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Час імпорту і першого ходу для інтерфейсів 'Світу Вампусу'")
+    parser.add_argument("--modules", nargs="+", choices=FRONT_END_GAMES, default=DEFAULT_MODULES)
+    parser.add_argument("--caves", type=int, nargs="+", default=[30, 10000])
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument("--repeat", type=int, default=5, help="запусків на модуль, зберігається найкращий")
+    parser.add_argument("--output", default="-", help="файл JSON lines, '-' для stdout")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    out.write(json.dumps({
+        "benchmark": "Lab4AI",
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }) + "\n")
+
+    for caves in args.caves:
+        for module in args.modules:
+            out.write(json.dumps(bench_module(module, caves, args.seed, args.repeat)) + "\n")
+            out.flush()
+
+    if out is not sys.stdout:
+        out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import random
+from array import array
+
+def generate_cave_map(num_caves=30, degree=3, seed=None):
+    """
+    Генерує випадковий degree-регулярний граф із заданою кількістю печер.
+    Використовується метод парування (pairing model); петлі та кратні ребра не змушують
+    починати заново, а виправляються локальною заміною ребер (double edge switch).
+    Ребра зберігаються в множині, тому перевірка дубліката O(1), а весь граф будується майже за лінійний час.
+    """
+    if num_caves * degree % 2 != 0:
+        raise ValueError("Кількість печер * ступінь повинні давати парне число.")
+    if degree >= num_caves:
+        raise ValueError("Ступінь має бути меншим за кількість печер.")
+    if degree == num_caves - 1:
+        # Повний граф - єдиний такий регулярний граф, заміни ребер його не знайдуть
+        return {node: [c for c in range(1, num_caves + 1) if c != node] for node in range(1, num_caves + 1)}
+    rng = random.Random(seed)
+    while True:
+        stubs = []
+        for node in range(1, num_caves + 1):
+            stubs.extend([node] * degree)
+        rng.shuffle(stubs)
+        edges = []
+        present = set()
+        bad = []
+        for i in range(0, len(stubs), 2):
+            a, b = stubs[i], stubs[i + 1]
+            key = (a, b) if a < b else (b, a)
+            if a == b or key in present:
+                bad.append(len(edges))
+            else:
+                present.add(key)
+            edges.append((a, b))
+
+        # Випадкове погане ребро (a, b) міняємо з випадковим добрим (c, d) на (a, c) і (b, d)
+        is_bad = set(bad)
+        attempts = 100 * len(edges) + 1000
+        while bad and attempts:
+            attempts -= 1
+            k = rng.randrange(len(bad))
+            i = bad[k]
+            j = rng.randrange(len(edges))
+            if j in is_bad:
+                continue
+            a, b = edges[i]
+            c, d = edges[j]
+            if rng.random() < 0.5:
+                c, d = d, c
+            first = (a, c) if a < c else (c, a)
+            second = (b, d) if b < d else (d, b)
+            if a == c or b == d or first == second or first in present or second in present:
+                continue
+            present.discard((c, d) if c < d else (d, c))
+            present.add(first)
+            present.add(second)
+            edges[i] = (a, c)
+            edges[j] = (b, d)
+            bad[k] = bad[-1]
+            bad.pop()
+            is_bad.discard(i)
+        if not bad:
+            break
+    caves = {node: [] for node in range(1, num_caves + 1)}
+    for a, b in edges:
+        caves[a].append(b)
+        caves[b].append(a)
+    return caves
+
+# Бітові маски небезпек у печері
+WUMPUS, PIT, BAT = 1, 2, 4
+
+class CaveMap:
+    def __init__(self, num_caves=30, degree=3, seed=None):
+        self.caves = generate_cave_map(num_caves, degree, seed)
+        self.num_caves = len(self.caves)
+        # CSR: сусіди печери c - це targets[offsets[c]:offsets[c + 1]]
+        self.offsets = array('i', bytes(4 * (self.num_caves + 2)))
+        targets = array('i')
+        for cave in range(1, self.num_caves + 1):
+            targets.extend(self.caves[cave])
+            self.offsets[cave + 1] = len(targets)
+        self.targets = targets
+        # Незмінні множини сусідів для перевірки суміжності за O(1)
+        self.neighbor_sets = [frozenset()] + [frozenset(self.caves[c]) for c in range(1, self.num_caves + 1)]
+
+    def get_neighbors(self, cave):
+        return self.caves.get(cave, [])
+
+    def is_adjacent(self, a, b):
+        """
+        Чи з'єднані печери a і b тунелем, за O(1)
+        """
+        return 0 < a <= self.num_caves and b in self.neighbor_sets[a]
+
+class Game:
+    """
+    Стан однієї гри без жодного інтерфейсу: методи повертають повідомлення, а консоль чи вікно
+    самі вирішують, як їх показати. seed робить гру відтворюваною (карта й усі випадкові
+    події беруться з self.rng).
+    """
+    def __init__(self, num_caves=30, seed=None):
+        self.rng = random.Random(seed)
+        self.map = CaveMap(num_caves, seed=self.rng.getrandbits(64))
+        # hazards[c] - маска небезпек у печері c, nearby[kind][c] - скільки таких небезпек у сусідів c.
+        # Підказки читаються за O(1), переміщення небезпеки коштує O(ступеня)
+        self.hazards = bytearray(self.map.num_caves + 1)
+        self.nearby = {kind: bytearray(self.map.num_caves + 1) for kind in (WUMPUS, PIT, BAT)}
+        self._placed = {WUMPUS: (), PIT: (), BAT: ()}
+        # Випадкова початкова позиція гравця
+        self.player = self.rng.choice(list(self.map.caves.keys()))
+        #  Вампус (не на позиції гравця)
+        self.wumpus = self.rng.choice([c for c in self.map.caves.keys() if c != self.player])
+        #  3 пасток
+        remaining = [c for c in self.map.caves.keys() if c not in (self.player, self.wumpus)]
+        self.pits = self.rng.sample(remaining, 3)
+        #  2 печер з кажанами
+        remaining = [c for c in remaining if c not in self.pits]
+        self.bats = self.rng.sample(remaining, 2)
+        self.arrows = 5
+        self.game_over = False
+        # Статистика гри: ходи, перенесення кажанами і причина завершення
+        self.moves = 0
+        self.bat_transports = 0
+        self.outcome = None
+
+    def _place(self, kind, caves):
+        # Знімає небезпеку kind зі старих печер і ставить у нові, оновлюючи лічильники сусідів
+        near = self.nearby[kind]
+        offsets, targets = self.map.offsets, self.map.targets
+        for cave in self._placed[kind]:
+            self.hazards[cave] &= ~kind
+            for k in range(offsets[cave], offsets[cave + 1]):
+                near[targets[k]] -= 1
+        for cave in caves:
+            self.hazards[cave] |= kind
+            for k in range(offsets[cave], offsets[cave + 1]):
+                near[targets[k]] += 1
+        self._placed[kind] = tuple(caves)
+
+    @property
+    def wumpus(self):
+        return self._placed[WUMPUS][0]
+
+    @wumpus.setter
+    def wumpus(self, cave):
+        self._place(WUMPUS, (cave,))
+
+    @property
+    def pits(self):
+        return self._placed[PIT]
+
+    @pits.setter
+    def pits(self, caves):
+        self._place(PIT, caves)
+
+    @property
+    def bats(self):
+        return self._placed[BAT]
+
+    @bats.setter
+    def bats(self, caves):
+        self._place(BAT, caves)
+
+    def end(self, outcome):
+        self.game_over = True
+        self.outcome = outcome
+
+    def check_current_room(self):
+        """
+        Перевіряє поточну печеру на наявність небезпек
+        Повертає відповідне повідомлення
+        """
+        hazards = self.hazards[self.player]
+        if hazards & WUMPUS:
+            self.end("wumpus")
+            return "Ви потрапили у печеру з Вампусом! Гра завершена."
+        elif hazards & PIT:
+            self.end("pit")
+            return "Ви впали у пастку! Гра завершена."
+        elif hazards & BAT:
+            self.bat_transports += 1
+            self.player = self.rng.randint(1, self.map.num_caves)
+            self.relocate_bats()
+            return "Кажани схопили вас і перенесли у випадкову печеру!\n" + self.check_current_room()
+        else:
+            return "Підказки: " + self.get_hints()
+
+    def percepts(self):
+        """
+        Що гравець відчуває у поточній печері: (запах Вампуса, холод пасток, шурхіт кажанів)
+        """
+        p = self.player
+        return bool(self.nearby[WUMPUS][p]), bool(self.nearby[PIT][p]), bool(self.nearby[BAT][p])
+
+    def get_hints(self):
+        """
+        Повертає підказки, якщо в суміжних печерах є небезпеки
+        """
+        stench, breeze, rustle = self.percepts()
+        hints = []
+        if stench:
+            hints.append("відчуваєте запах Вампуса")
+        if breeze:
+            hints.append("відчуваєте холод пасток")
+        if rustle:
+            hints.append("чуєте шурхіт крил кажанів")
+        return "; ".join(hints) if hints else "поруч немає відчутних небезпек."
+
+    def move_player(self, dest):
+        # переміщуєм гравця, якщо обрана печера суміжна
+        if self.map.is_adjacent(self.player, dest):
+            self.player = dest
+            self.moves += 1
+            return self.check_current_room()
+        return "Ця печера не суміжна з вашою. Спробуйте ще раз."
+
+    def shoot_arrow(self, path):
+        """
+        Симулює постріл стрілою за заданою послідовністю печер
+        Якщо стріла потрапляє у Вампуса, гравець переможе
+        """
+        messages = []
+        current = self.player
+        for dest in path:
+            if self.map.is_adjacent(current, dest):
+                current = dest
+                if current == self.wumpus:
+                    self.end("win")
+                    return "Стріла влучила у Вампуса! Ви перемогли!"
+            else:
+                messages.append(f"Стріла не може пройти через печеру {dest}.")
+                break
+        self.arrows -= 1
+        messages.append(f"Стріла не знайшла ціль. Залишилося стріл: {self.arrows}")
+        if self.arrows == 0:
+            messages.append("Ви використали всі стріли. Гра завершена.")
+            self.end("arrows")
+        else:
+            # 75% шанс, що Вампус переміститься після промаху
+            if self.rng.random() < 0.75:
+                neighbors = self.map.get_neighbors(self.wumpus)
+                if neighbors:
+                    self.wumpus = self.rng.choice(neighbors)
+                    messages.append("Вампус почув шум і перемістився!")
+                    if self.wumpus == self.player:
+                        messages.append("Вампус з'явився у вашій печері! Гра завершена.")
+                        self.end("wumpus_moved")
+        return "\n".join(messages)
+
+    def relocate_bats(self):
+        """
+        Переміщує кажанів у нові печери, уникаючи позицій гравця, вампуса та пасток
+        """
+        n = self.map.num_caves
+        blocked = {self.player, self.wumpus, *self.pits}
+        if n - len(blocked) < 2:
+            self.bats = [c for c in range(1, n + 1) if c not in blocked]
+            return
+        # Вибираємо випадкові печери з відкиданням зайнятих, щоб не перебирати всю карту
+        bats = []
+        while len(bats) < 2:
+            cave = self.rng.randint(1, n)
+            if cave not in blocked:
+                blocked.add(cave)
+                bats.append(cave)
+        self.bats = bats
@@ -0,0 +1,168 @@
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from Lab4AIAgent import BeliefAgent
+from Lab4AIEngine import Game
+
+
+class RandomAgent:
+    """
+    Ходить у випадкову суміжну печеру і ніколи не стріляє.
+    """
+    def __init__(self, game, rng):
+        self.game = game
+        self.rng = rng
+
+    def act(self):
+        return "move", self.rng.choice(self.game.map.get_neighbors(self.game.player))
+
+
+class HunterAgent:
+    """
+    Пам'ятає відвідані (безпечні) печери і підозрілі - сусідні з тими, де відчувалась небезпека.
+    Відчувши Вампуса, стріляє в сусідню невідому печеру; досліджує непідозрілі печери,
+    а якщо довго не знаходить нових, ризикує піти в підозрілу.
+    """
+    def __init__(self, game, rng, patience=30):
+        self.game = game
+        self.rng = rng
+        self.patience = patience
+        self.safe = set()
+        self.suspect = set()
+        self.stuck = 0
+
+    def act(self):
+        game = self.game
+        if game.player not in self.safe:
+            self.safe.add(game.player)
+            self.suspect.discard(game.player)
+            self.stuck = 0
+        else:
+            self.stuck += 1
+        neighbors = game.map.get_neighbors(game.player)
+        unknown = [c for c in neighbors if c not in self.safe]
+        stench, breeze, rustle = game.percepts()
+        if stench and unknown:
+            return "shoot", [self.rng.choice(unknown)]
+        if breeze or rustle:
+            self.suspect.update(unknown)
+        fresh = [c for c in unknown if c not in self.suspect]
+        if fresh:
+            return "move", self.rng.choice(fresh)
+        if unknown and self.stuck > self.patience:
+            return "move", self.rng.choice(unknown)
+        known = [c for c in neighbors if c in self.safe]
+        return "move", self.rng.choice(known or neighbors)
+
+
+AGENTS = {
+    "random": RandomAgent,
+    "hunter": HunterAgent,
+    "belief": BeliefAgent,
+}
+
+
+def play_game(seed, num_caves=30, agent="hunter", max_turns=1000):
+    """
+    Грає одну гру без вводу й виводу: агент обирає дії, поки гра не завершиться
+    або не вичерпається max_turns. Повертає запис з результатом гри.
+    """
+    game = Game(num_caves, seed=seed)
+    player = AGENTS[agent](game, random.Random(seed ^ 0x5EED))
+    turns = shots = 0
+    while not game.game_over and turns < max_turns:
+        action, target = player.act()
+        if action == "move":
+            game.move_player(target)
+        else:
+            # Влучна стріла не зменшує game.arrows, тому постріли рахуються тут
+            game.shoot_arrow(target)
+            shots += 1
+        turns += 1
+    return {
+        "seed": seed,
+        "agent": agent,
+        "outcome": game.outcome or "timeout",
+        "turns": turns,
+        "moves": game.moves,
+        "arrows_used": shots,
+        "bat_transports": game.bat_transports,
+    }
+
+
+def _play_task(task):
+    return play_game(*task)
+
+
+def simulate(games, seed=0, num_caves=30, agent="hunter", max_turns=1000, workers=None, chunksize=256):
+    """
+    Розподіляє ігри з зернами seed, seed + 1, ... між процесами.
+    Повертає записи ігор у порядку завершення.
+    """
+    tasks = ((seed + i, num_caves, agent, max_turns) for i in range(games))
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_play_task, tasks, chunksize)
+
+
+class Summary:
+    """
+    Поступово накопичує підсумки ігор, не зберігаючи самі записи.
+    """
+    def __init__(self):
+        self.games = 0
+        self.outcomes = Counter()
+        self.totals = Counter()
+
+    def add(self, record):
+        self.games += 1
+        self.outcomes[record["outcome"]] += 1
+        for key in ("turns", "moves", "arrows_used", "bat_transports"):
+            self.totals[key] += record[key]
+
+    def as_dict(self):
+        games = max(1, self.games)
+        result = {
+            "games": self.games,
+            "win_rate": round(self.outcomes["win"] / games, 4),
+            "outcomes": dict(self.outcomes),
+        }
+        for key, total in self.totals.items():
+            result["mean_" + key] = round(total / games, 3)
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Масова симуляція ігор 'Світ Вампусу' без інтерфейсу")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--agent", choices=AGENTS, default="hunter")
+    parser.add_argument("--caves", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0, help="зерно першої гри, наступні +1")
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів, за замовчуванням усі ядра")
+    parser.add_argument("--output", help="файл JSON lines для записів кожної гри")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w") if args.output else None
+    summary = Summary()
+    started = time.perf_counter()
+    for record in simulate(args.games, args.seed, args.caves, args.agent, args.max_turns, args.workers):
+        summary.add(record)
+        if out:
+            out.write(json.dumps(record) + "\n")
+    seconds = time.perf_counter() - started
+    if out:
+        out.close()
+
+    result = summary.as_dict()
+    result.update(agent=args.agent, caves=args.caves, seconds=round(seconds, 3),
+                  games_per_second=round(summary.games / seconds))
+    sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,146 +1,7 @@
-import pygame # type: ignore
-import random
 import math
 import sys
 
-
-def generate_cave_map(num_caves=30, degree=3):
-    """
-    Генерує випадкову карту печер у вигляді 3-регулярного графа (кожна печера має 'degree' суміжних печер)
-    з використанням моделі парування
-    """
-    if num_caves * degree % 2 != 0:
-        raise ValueError("Кількість печер * ступінь має бути парною")
-    while True:
-        stubs = []
-        # Додаємо "стаби" для кожної печери
-        for node in range(1, num_caves + 1):
-            stubs.extend([node] * degree)
-        random.shuffle(stubs)
-        edges = []
-        valid = True
-        # робим пари та перевіряємо коректність з'єднань
-        for i in range(0, len(stubs), 2):
-            a = stubs[i]
-            b = stubs[i + 1]
-            if a == b or ((a, b) in edges or (b, a) in edges):
-                valid = False
-                break
-            else:
-                edges.append((a, b))
-        if valid:
-            break
-    # словник печер та їх суміжностей
-    caves = {node: [] for node in range(1, num_caves + 1)}
-    for a, b in edges:
-        caves[a].append(b)
-        caves[b].append(a)
-    return caves
-
-class CaveMap:
-    def __init__(self, num_caves=30, degree=3):
-        # Ініціалізація карти печер
-        self.caves = generate_cave_map(num_caves, degree)
-
-    def get_neighbors(self, cave):
-        # Повертає суміжні печери для заданої печери
-        return self.caves.get(cave, [])
-
-class Game:
-    def __init__(self, num_caves=30):
-        self.map = CaveMap(num_caves)
-        self.player = random.choice(list(self.map.caves.keys()))
-        # Вампус
-        self.wumpus = random.choice([c for c in self.map.caves.keys() if c != self.player])
-        # 3 пастки
-        remaining = [c for c in self.map.caves.keys() if c not in (self.player, self.wumpus)]
-        self.pits = random.sample(remaining, 3)
-        # 2 печери з бетменами :)
-        remaining = [c for c in remaining if c not in self.pits]
-        self.bats = random.sample(remaining, 2)
-        self.arrows = 5
-        self.game_over = False
-
-    def check_current_room(self):
-        """
-        Перевіряє поточну печеру на наявність небезпек
-        Повертає відповідне повідомлення
-        """
-        if self.player == self.wumpus:
-            self.game_over = True
-            return "Ви увійшли в печеру Вампуса! Гра завершена."
-        elif self.player in self.pits:
-            self.game_over = True
-            return "Ви впали в пастку! Гра завершена."
-        elif self.player in self.bats:
-            self.player = random.choice(list(self.map.caves.keys()))
-            self.relocate_bats()
-            return "Кажани перенесли вас в іншу печеру!"
-        else:
-            return self.get_hints()
-
-    def get_hints(self):
-        """
-        Повертає підказки, якщо в суміжних печерах є небезпеки
-        """
-        neighbors = self.map.get_neighbors(self.player)
-        hints = []
-        if self.wumpus in neighbors:
-            hints.append("відчуваєте запах Вампуса")
-        if any(p in neighbors for p in self.pits):
-            hints.append("відчуваєте холод пасток")
-        if any(b in neighbors for b in self.bats):
-            hints.append("чуєте шелест кажанів")
-        return "; ".join(hints) if hints else "Немає небезпек поруч."
-
-    def move_player(self, dest):
-        # переміщуєм гравця, якщо обрана печера суміжна
-        if dest in self.map.get_neighbors(self.player):
-            self.player = dest
-            return self.check_current_room()
-        else:
-            return "Ця печера не суміжна. Спробуйте ще раз."
-
-    def shoot_arrow(self, path):
-        """
-        Симулює постріл стрілою за заданою послідовністю печер
-        Якщо стріла потрапляє у Вампуса, гравець переможе
-        """
-        current = self.player
-        for dest in path:
-            if dest in self.map.get_neighbors(current):
-                current = dest
-                if current == self.wumpus:
-                    self.game_over = True
-                    return "Ваша стріла влучила у Вампуса! Ви виграли!"
-            else:
-                return f"Стріла не може пройти через печеру {dest}."
-        self.arrows -= 1
-        result = f"Стріла промахнулася. Залишилося стріл: {self.arrows}"
-        if self.arrows == 0:
-            self.game_over = True
-            result += "\nВи використали всі стріли. Гра завершена."
-        else:
-            # 75% шанс, що Вампус переміститься після промаху
-            if random.random() < 0.75:
-                neighbors = self.map.get_neighbors(self.wumpus)
-                if neighbors:
-                    self.wumpus = random.choice(neighbors)
-                    result += "\nВампус почув шум і перемістився!"
-                    if self.wumpus == self.player:
-                        self.game_over = True
-                        result += "\nВампус увійшов у вашу печеру! Гра завершена."
-        return result
-
-    def relocate_bats(self):
-        """
-        Переміщує кажанів у нові печери, уникаючи позицій гравця, вампуса та пасток
-        """
-        available = [c for c in self.map.caves.keys() if c not in (self.player, self.wumpus) and c not in self.pits]
-        if len(available) >= 2:
-            self.bats = random.sample(available, 2)
-        else:
-            self.bats = available
+from Lab4AIEngine import BAT, PIT, WUMPUS, Game
 
 
 class VisualGameApp:
@@ -149,6 +10,8 @@ class VisualGameApp:
     SCREEN_HEIGHT = 600
 
     def __init__(self):
+        # pygame і шрифти завантажуються лише тоді, коли відкривається вікно
+        import pygame # type: ignore
         pygame.init()
         self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
         pygame.display.set_caption("Hunt the Wumpus")
@@ -175,6 +38,7 @@ class VisualGameApp:
             self.node_positions[i] = (int(x), int(y))
 
     def draw_map(self):
+        import pygame
         # Малюємо ребра між печерами
         drawn_edges = set()
         for node, neighbors in self.game.map.caves.items():
@@ -197,28 +61,29 @@ class VisualGameApp:
     def get_node_color(self, node):
         # Якщо гра завершена, показуємо розташування небезпек
         if self.game.game_over:
-            if node == self.game.wumpus:
+            hazards = self.game.hazards[node]
+            if hazards & WUMPUS:
                 return (255, 0, 0)  # червоний для Вампуса
-            if node in self.game.pits:
+            if hazards & PIT:
                 return (128, 128, 128)  # сірий для пасток
-            if node in self.game.bats:
+            if hazards & BAT:
                 return (160, 32, 240)  # фіолетовий для кажанів
         # Виділяємо печеру гравця
         if node == self.game.player:
             return (0, 255, 0)  # зелений
         # У режимі переміщення підсвічуємо суміжні печери
         if self.mode == "move":
-            if node in self.game.map.get_neighbors(self.game.player):
+            if self.game.map.is_adjacent(self.game.player, node):
                 return (173, 216, 230)  # світло-блакитний
         # У режимі стрільби підсвічуємо вибрані кроки
         if self.mode == "shoot":
             if node in self.arrow_path:
                 return (255, 165, 0)  # помаранчевий
-            if not self.arrow_path and node in self.game.map.get_neighbors(self.game.player):
+            if not self.arrow_path and self.game.map.is_adjacent(self.game.player, node):
                 return (173, 216, 230)
             if self.arrow_path:
                 last = self.arrow_path[-1]
-                if node in self.game.map.get_neighbors(last):
+                if self.game.map.is_adjacent(last, node):
                     return (173, 216, 230)
         return (255, 255, 255)  # білий
 
@@ -257,7 +122,7 @@ class VisualGameApp:
             return
         if self.mode == "move":
             # У режимі переміщення переміщуємо гравця
-            if node in self.game.map.get_neighbors(self.game.player):
+            if self.game.map.is_adjacent(self.game.player, node):
                 msg = self.game.move_player(node)
                 print(msg)
                 self.arrow_path = []  # очищення шляху стрільби
@@ -266,18 +131,19 @@ class VisualGameApp:
         elif self.mode == "shoot":
             # будуємо послідовність печер для стрільби
             if not self.arrow_path:
-                if node in self.game.map.get_neighbors(self.game.player):
+                if self.game.map.is_adjacent(self.game.player, node):
                     self.arrow_path.append(node)
                 else:
                     print("Перший крок повинен бути суміжною печерою від вашої.")
             else:
                 last = self.arrow_path[-1]
-                if node in self.game.map.get_neighbors(last):
+                if self.game.map.is_adjacent(last, node):
                     self.arrow_path.append(node)
                 else:
                     print("Наступна печера має бути суміжною до останньої в шляху.")
 
     def handle_key(self, key):
+        import pygame
         if key == pygame.K_m:
             self.mode = "move"
             self.arrow_path = []
@@ -298,6 +164,7 @@ class VisualGameApp:
             self.arrow_path = []
 
     def run(self):
+        import pygame
         running = True
         while running:
             self.clock.tick(30)  # 30 фпс
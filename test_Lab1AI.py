@@ -0,0 +1,140 @@
+import unittest
+
+import numpy as np
+
+from Lab1AI import CellularAutomaton
+
+# Board sizes that are multiples of neither the 64-bit word nor the tile size
+SIZES = [(70, 37), (131, 21)]
+GENERATIONS = 6
+
+GLIDER = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+
+def make_sim(cols, rows, backend, seed, rule="B3/S23"):
+    sim = CellularAutomaton(cols, rows, 1, backend=backend, tile_size=16, workers=2, rule=rule)
+    sim.generate_random_grid(0.3, seed)
+    return sim
+
+
+class BackendEquivalenceTest(unittest.TestCase):
+    """
+    Every stepping backend must produce the same boards as the cell-by-cell loop.
+    """
+
+    def check_backend(self, backend, rule="B3/S23"):
+        for seed, (cols, rows) in enumerate(SIZES):
+            reference = make_sim(cols, rows, "loop", seed, rule)
+            sim = make_sim(cols, rows, backend, seed, rule)
+            try:
+                for generation in range(1, GENERATIONS + 1):
+                    reference.update_grid()
+                    sim.update_grid()
+                    np.testing.assert_array_equal(
+                        sim.grid, reference.grid, err_msg=f"{backend} {cols}x{rows} generation {generation}")
+            finally:
+                sim.close()
+
+    def test_numpy(self):
+        self.check_backend("numpy")
+
+    def test_bitpacked(self):
+        self.check_backend("bitpacked")
+
+    def test_tiled(self):
+        self.check_backend("tiled")
+
+    def test_parallel(self):
+        self.check_backend("parallel")
+
+    def test_other_rule(self):
+        for backend in ("numpy", "bitpacked", "tiled"):
+            self.check_backend(backend, rule="B36/S23")
+
+    def test_advance_matches_stepping(self):
+        # A soup that fills the torus, so HashLife has to give way to plain stepping
+        for n in (1, 7, 37):
+            jumped = make_sim(40, 30, "numpy", n)
+            stepped = make_sim(40, 30, "numpy", n)
+            jumped.advance(n)
+            for _ in range(n):
+                stepped.update_grid()
+            np.testing.assert_array_equal(jumped.grid, stepped.grid, err_msg=f"advance({n})")
+
+    def test_advance_on_power_of_two_torus(self):
+        # The whole jump runs in HashLife, even for a soup that fills the board
+        for n in (1, 7, 100):
+            jumped = make_sim(64, 32, "numpy", n)
+            stepped = make_sim(64, 32, "numpy", n)
+            jumped.advance(n)
+            for _ in range(n):
+                stepped.update_grid()
+            self.assertEqual(jumped.hashlife.generation, n)
+            np.testing.assert_array_equal(jumped.grid, stepped.grid, err_msg=f"advance({n})")
+
+    def test_advance_on_plane(self):
+        # A glider on a 100x90 board fits jumps of up to 32 generations
+        for backend in ("numpy", "tiled", "bitpacked"):
+            jumped = make_sim(100, 90, backend, 0)
+            stepped = make_sim(100, 90, backend, 0)
+            jumped.apply_preset(GLIDER)
+            stepped.apply_preset(GLIDER)
+            jumped.advance(37)
+            for _ in range(37):
+                stepped.update_grid()
+            self.assertEqual(jumped.hashlife.generation, 37)
+            np.testing.assert_array_equal(jumped.grid, stepped.grid, err_msg=backend)
+
+    def test_advance_skips_whole_periods(self):
+        # A glider crosses the 40x30 torus back onto itself every 4 * lcm(40, 30) = 480 generations
+        jumped = make_sim(40, 30, "numpy", 0)
+        stepped = make_sim(40, 30, "numpy", 0)
+        jumped.apply_preset(GLIDER)
+        stepped.apply_preset(GLIDER)
+        jumped.advance(10**6)
+        for _ in range(10**6 % 480):
+            stepped.update_grid()
+        self.assertEqual(jumped.generation, 10**6)
+        self.assertEqual(jumped.period, 480)
+        np.testing.assert_array_equal(jumped.grid, stepped.grid)
+
+
+class CycleDetectionTest(unittest.TestCase):
+    """
+    The incrementally kept hash and population must match a full rehash, and cycles must be exact.
+    """
+
+    def test_incremental_hash(self):
+        for backend in ("numpy", "bitpacked", "tiled", "parallel"):
+            sim = make_sim(37, 29, backend, 1)
+            try:
+                for generation in range(1, 31):
+                    sim.update_grid()
+                    zobrist, live = sim.zobrist.copy(), sim.live
+                    sim.rehash()
+                    np.testing.assert_array_equal(zobrist, sim.zobrist, err_msg=f"{backend} generation {generation}")
+                    self.assertEqual(live, np.count_nonzero(sim.grid))
+                    self.assertEqual(live, sim.live)
+                    self.assertIs(type(sim.population()), int)
+            finally:
+                sim.close()
+
+    def test_period_and_cycle_start(self):
+        for seed in range(10):
+            sim = make_sim(20, 16, "tiled", seed)
+            reference = make_sim(20, 16, "numpy", seed)
+            seen = {reference.grid.tobytes(): 0}
+            while True:
+                reference.update_grid()
+                board = reference.grid.tobytes()
+                if board in seen:
+                    break
+                seen[board] = reference.generation
+            while sim.period is None:
+                sim.update_grid()
+            self.assertEqual((sim.cycle_start, sim.period),
+                             (seen[board], reference.generation - seen[board]), f"seed {seed}")
+
+
+if __name__ == "__main__":
+    unittest.main()